@@ -0,0 +1,113 @@
+"""Concurrent ``/chat`` load with the LLM, Mongo and Qdrant mocked out.
+
+Fires N simultaneous ``/chat`` requests at the FastAPI app in-process and
+compares two agents with the same per-turn latency:
+
+* ``blocking`` sleeps on the event loop, like the old ``print_stream`` path
+  where the ReAct loop, the OpenAI calls and pymongo all ran synchronously;
+* ``async`` awaits the same latency through ``Agent.ainvoke``.
+
+If requests overlap, the async wall time stays close to one turn while the
+blocking one grows linearly with N.
+
+Run from ``backend/``::
+
+    python -m benchmarks.chat_concurrency --requests 1 8 32 --latency 0.2
+"""
+
+import argparse
+import asyncio
+import importlib
+import time
+
+import httpx
+
+from src.agent import Agent
+
+
+class FakeMessage:
+    def __init__(self, content):
+        self.content = content
+
+
+class FakeMemoryHandler:
+    """Async memory handler with a fixed round-trip time and no storage."""
+
+    def __init__(self, db_latency):
+        self.db_latency = db_latency
+
+    async def aretrieve_conversation(self, user_thread, last_k=None):
+        await asyncio.sleep(self.db_latency)
+        return {}
+
+    async def ainsert_or_update_conversation(self, conversation_infor):
+        await asyncio.sleep(self.db_latency)
+
+
+class AsyncReactAgent:
+    def __init__(self, latency):
+        self.latency = latency
+
+    async def astream(self, state, stream_mode=None):
+        await asyncio.sleep(self.latency)
+        yield {"messages": [FakeMessage("ok")]}
+
+
+class BlockingReactAgent(AsyncReactAgent):
+    async def astream(self, state, stream_mode=None):
+        time.sleep(self.latency)
+        yield {"messages": [FakeMessage("ok")]}
+
+
+def _fake_init(self):
+    self.memory_handler = None
+    self.react_agent = None
+    self.database_handler = None
+
+
+async def _run(app, n_requests):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        start = time.perf_counter()
+        responses = await asyncio.gather(
+            *(
+                client.post("/chat", json={"question": "hi", "user_id": str(i)})
+                for i in range(n_requests)
+            )
+        )
+        elapsed = time.perf_counter() - start
+    assert all(response.status_code == 200 for response in responses)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--latency", type=float, default=0.2, help="LLM seconds")
+    parser.add_argument("--db-latency", type=float, default=0.005)
+    args = parser.parse_args()
+
+    # src.main builds its Agent at import time; keep it off the network.
+    Agent.__init__ = _fake_init
+    main_module = importlib.import_module("src.main")
+
+    agent = main_module.agent
+    agent.memory_handler = FakeMemoryHandler(args.db_latency)
+    print(f"{'agent':<10}{'requests':>10}{'wall s':>10}{'req/s':>10}")
+    for name, react_agent in (
+        ("blocking", BlockingReactAgent(args.latency)),
+        ("async", AsyncReactAgent(args.latency)),
+    ):
+        agent.react_agent = react_agent
+        for n_requests in args.requests:
+            elapsed = asyncio.run(_run(main_module.app, n_requests))
+            print(
+                f"{name:<10}{n_requests:>10}{elapsed:>10.3f}"
+                f"{n_requests / elapsed:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""CPU latency, throughput and parity of each embedding backend.
+
+For every backend in ``EMBEDDING_BACKENDS`` this measures single-query
+latency (batch of one, the ``/chat`` path), document throughput at the
+ingestion batch size and the cosine agreement with the torch backend.
+
+Run from ``backend/``::
+
+    python -m benchmarks.embedding_backends --offline
+    python -m benchmarks.embedding_backends --model nomic-ai/nomic-embed-text-v1.5
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+import numpy as np
+from fastembed import TextEmbedding
+from fastembed.common.model_description import ModelSource, PoolingType
+
+from benchmarks.standin_model import build_standin_model, export_onnx, sample_texts
+from src.database_handler.embedding_backends import (
+    EMBEDDING_BACKENDS,
+    create_embedding_backend,
+)
+
+
+def _offline_backends(directory):
+    """Backends over the stand-in model, exported to ONNX for fastembed."""
+    model_dir = build_standin_model(directory)
+    backends = {"torch": create_embedding_backend("torch", model_dir)}
+    for name, quantize in (("fastembed", False), ("fastembed-int8", True)):
+        onnx_dir = export_onnx(model_dir, os.path.join(directory, name), quantize)
+        model_name = f"standin/{name}"
+        TextEmbedding.add_custom_model(
+            model=model_name,
+            pooling=PoolingType.MEAN,
+            normalization=True,
+            sources=ModelSource(hf=model_name),
+            dim=768,
+            model_file="model.onnx",
+        )
+        backend = create_embedding_backend("fastembed", model_name)
+        backend.name = name
+        # fastembed cannot download a local model; point it at the export.
+        backend._load = lambda model_name=model_name, onnx_dir=onnx_dir: (
+            TextEmbedding(model_name=model_name, specific_model_path=onnx_dir)
+        )
+        backends[name] = backend
+    return backends
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default="nomic-ai/nomic-embed-text-v1.5")
+    parser.add_argument(
+        "--offline", action="store_true", help="random-weight stand-in model"
+    )
+    parser.add_argument("--queries", type=int, default=64)
+    parser.add_argument("--documents", type=int, default=256)
+    parser.add_argument("--batch-size", type=int, default=32)
+    args = parser.parse_args()
+
+    if args.offline:
+        backends = _offline_backends(tempfile.mkdtemp(prefix="standin-"))
+    else:
+        backends = {
+            name: create_embedding_backend(name, args.model)
+            for name in EMBEDDING_BACKENDS
+        }
+
+    queries = sample_texts(args.queries, seed=1)
+    documents = sample_texts(args.documents, n_words=120, seed=2)
+    baseline = None
+    print(
+        f"{'backend':<16}{'load s':>8}{'q p50 ms':>10}{'q p95 ms':>10}"
+        f"{'docs/s':>9}{'min cos':>9}{'mean cos':>10}"
+    )
+    for name, backend in backends.items():
+        start = time.perf_counter()
+        try:
+            backend.model
+        except Exception as e:
+            print(f"{name:<16}failed to load: {e}")
+            continue
+        load_seconds = time.perf_counter() - start
+        backend.encode(queries[:4], batch_size=4, normalize=True)  # warm-up
+
+        latencies = []
+        for query in queries:
+            start = time.perf_counter()
+            backend.encode([query], batch_size=1, normalize=True)
+            latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        vectors = backend.encode(documents, batch_size=args.batch_size, normalize=True)
+        docs_per_second = len(documents) / (time.perf_counter() - start)
+
+        if baseline is None:
+            baseline = vectors
+        cosine = np.sum(vectors * baseline, axis=1)
+        print(
+            f"{name:<16}{load_seconds:>8.1f}"
+            f"{statistics.median(latencies) * 1000:>10.1f}"
+            f"{statistics.quantiles(latencies, n=20)[-1] * 1000:>10.1f}"
+            f"{docs_per_second:>9.1f}{cosine.min():>9.4f}{cosine.mean():>10.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
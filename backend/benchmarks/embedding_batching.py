@@ -0,0 +1,92 @@
+"""Throughput of micro-batched vs per-request query embedding on CPU.
+
+Every simulated ``/chat`` request embeds one distinct query through
+``EmbeddingHandler.aget_embedding``. With ``micro_batching`` off each call
+runs its own ``encode``; with it on, concurrent calls share one encode per
+batch window. The LRU cache is disabled so every call reaches the model.
+
+Run from ``backend/``::
+
+    python -m benchmarks.embedding_batching --offline
+    python -m benchmarks.embedding_batching --model nomic-ai/nomic-embed-text-v1.5
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+
+from benchmarks.standin_model import build_standin_model, sample_texts
+from src.database_handler.embedding_handler import EmbeddingHandler
+
+
+async def _run(handler, texts, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(text):
+        async with semaphore:
+            start = time.perf_counter()
+            await handler.aget_embedding(text)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(text) for text in texts))
+    return time.perf_counter() - start, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default="nomic-ai/nomic-embed-text-v1.5")
+    parser.add_argument(
+        "--offline", action="store_true", help="random-weight stand-in model"
+    )
+    parser.add_argument("--requests", type=int, default=256)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    model_name = args.model
+    if args.offline:
+        model_name = build_standin_model(tempfile.mkdtemp(prefix="standin-"))
+
+    print(
+        f"{'mode':<12}{'conc':>6}{'texts/s':>10}{'p50 ms':>10}{'p95 ms':>10}"
+        f"{'encodes':>9}"
+    )
+    for micro_batching in (False, True):
+        handler = EmbeddingHandler(
+            model_name=model_name,
+            cache_size=0,
+            micro_batching=micro_batching,
+            max_batch_size=32,
+            max_wait_ms=args.max_wait_ms,
+        )
+        handler.load_model()
+        encode = handler.backend.encode
+        calls = []
+
+        def counting_encode(texts, **kwargs):
+            calls.append(len(texts))
+            return encode(texts, **kwargs)
+
+        handler.backend.encode = counting_encode
+        asyncio.run(_run(handler, sample_texts(8, seed=1), 8))  # warm-up
+        for concurrency in args.concurrency:
+            calls.clear()
+            texts = sample_texts(args.requests, seed=concurrency)
+            elapsed, latencies = asyncio.run(_run(handler, texts, concurrency))
+            p95 = statistics.quantiles(latencies, n=20)[-1]
+            print(
+                f"{'batched' if micro_batching else 'per-request':<12}"
+                f"{concurrency:>6}{len(texts) / elapsed:>10.1f}"
+                f"{statistics.median(latencies) * 1000:>10.1f}{p95 * 1000:>10.1f}"
+                f"{len(calls):>9}"
+            )
+        if handler.batcher is not None:
+            handler.batcher.close()
+
+
+if __name__ == "__main__":
+    main()
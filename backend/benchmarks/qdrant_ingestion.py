@@ -0,0 +1,133 @@
+"""Markdown ingestion throughput into an in-memory Qdrant.
+
+Compares the original one-chunk-at-a-time path (``save_text_to_qdrant``
+per chunk: one encode and one upsert each) with ``insert_markdown_directory``
+(batched embedding and batched uploads through IngestionPipeline) on a
+generated markdown corpus, using ``QdrantClient(":memory:")``.
+
+The local client is not thread-safe for concurrent writes, so the pipeline
+runs with one upload thread here; with ``--server`` (QDRANT_URL) pass
+``--parallel``.
+
+Run from ``backend/``::
+
+    python -m benchmarks.qdrant_ingestion --offline
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from collections import defaultdict
+
+from qdrant_client import QdrantClient
+
+from benchmarks.standin_model import build_standin_model, sample_texts
+from src.database_handler.embedding_handler import EmbeddingHandler
+from src.database_handler.qdrant_connector import QdrantDBClient
+
+
+def _write_corpus(directory, n_files, words_per_file):
+    for i in range(n_files):
+        paragraphs = sample_texts(words_per_file // 40, n_words=40, seed=i)
+        with open(os.path.join(directory, f"brochure-{i}.md"), "w") as f:
+            f.write(f"# Brochure {i}\n\n" + "\n\n".join(paragraphs))
+
+
+def _make_client(model_name, collection_name, server):
+    client = QdrantDBClient(collection_name=collection_name)
+    if server:
+        client.connect_to_database()
+    else:
+        client.client = QdrantClient(":memory:")
+    client.embedding_handler = EmbeddingHandler(model_name=model_name, cache_size=0)
+    # Brochure PDFs are not part of the benchmark.
+    client.upload_pdf_file_to_s3 = lambda filename: f"local://{filename}"
+    client.create_collection()
+    return client
+
+
+def _timed(timings, key, fn):
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            timings[key] += time.perf_counter() - start
+
+    return wrapper
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default="nomic-ai/nomic-embed-text-v1.5")
+    parser.add_argument(
+        "--offline", action="store_true", help="random-weight stand-in model"
+    )
+    parser.add_argument(
+        "--server", action="store_true", help="use QDRANT_URL instead of :memory:"
+    )
+    parser.add_argument("--files", type=int, default=8)
+    parser.add_argument("--words-per-file", type=int, default=2000)
+    parser.add_argument("--embed-batch-size", type=int, default=64)
+    parser.add_argument("--upsert-batch-size", type=int, default=256)
+    parser.add_argument("--parallel", type=int, default=1)
+    args = parser.parse_args()
+
+    model_name = args.model
+    if args.offline:
+        model_name = build_standin_model(tempfile.mkdtemp(prefix="standin-"))
+    corpus = tempfile.mkdtemp(prefix="corpus-")
+    _write_corpus(corpus, args.files, args.words_per_file)
+
+    rows = []
+
+    client = _make_client(model_name, "bench_per_chunk", args.server)
+    client.embedding_handler.load_model()
+    timings = defaultdict(float)
+    client.embed_points = _timed(timings, "embed", client.embed_points)
+    client.insert_vectors = _timed(timings, "upsert", client.insert_vectors)
+    points = list(client.iter_markdown_directory_points(corpus))
+    start = time.perf_counter()
+    for point in points:
+        client.save_text_to_qdrant(
+            point["id"], point["payload"]["text"], point["payload"]
+        )
+    seconds = time.perf_counter() - start
+    count = client.get_collection_info()["points_count"]
+    rows.append(("per-chunk", count, seconds, timings["embed"], timings["upsert"]))
+
+    client = _make_client(model_name, "bench_pipeline", args.server)
+    client.embedding_handler.load_model()
+    client.insert_markdown_directory(
+        corpus,
+        embed_batch_size=args.embed_batch_size,
+        upsert_batch_size=args.upsert_batch_size,
+        parallel=args.parallel,
+        incremental=False,
+    )
+    stats = client.last_ingestion_stats
+    count = client.get_collection_info()["points_count"]
+    rows.append(
+        (
+            "pipeline",
+            count,
+            stats["seconds"],
+            stats["embed_seconds"],
+            stats["upsert_seconds"],
+        )
+    )
+
+    print(
+        f"{'path':<12}{'points':>8}{'wall s':>9}{'chunks/s':>10}"
+        f"{'embed s':>9}{'upsert s':>10}"
+    )
+    for name, count, seconds, embed, upsert in rows:
+        print(
+            f"{name:<12}{count:>8}{seconds:>9.2f}{count / seconds:>10.2f}"
+            f"{embed:>9.2f}{upsert:>10.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Per-query search loop vs one search_batch request.
+
+Fills a collection with random normalised vectors and, for 1/8/64
+queries, times ``search_vectors`` called once per query, one raw
+``search_batch`` request, and ``search_vectors_batch`` (which only batches
+when that saves round trips). Embedding and reranking are left out so only
+the Qdrant side is measured.
+
+Run from ``backend/``::
+
+    python -m benchmarks.qdrant_search               # QdrantClient(":memory:")
+    python -m benchmarks.qdrant_search --server      # QDRANT_URL
+"""
+
+import argparse
+import statistics
+import time
+
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.http.models import SearchRequest
+
+from src.database_handler.qdrant_connector import QdrantDBClient
+
+
+def _median_ms(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--server", action="store_true", help="use QDRANT_URL instead of :memory:"
+    )
+    parser.add_argument("--points", type=int, default=2000)
+    parser.add_argument("--queries", type=int, nargs="+", default=[1, 8, 64])
+    parser.add_argument("--limit", type=int, default=5)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    client = QdrantDBClient(collection_name="bench_search")
+    if args.server:
+        client.connect_to_database()
+    else:
+        client.client = QdrantClient(":memory:")
+    client.create_collection()
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((args.points, client.vector_size), np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    for offset in range(0, args.points, 256):
+        client.insert_vectors(
+            [
+                {"id": i, "vector": vectors[i], "payload": {"text": f"chunk {i}"}}
+                for i in range(offset, min(offset + 256, args.points))
+            ]
+        )
+
+    print(
+        f"{'queries':>8}{'loop ms':>10}{'search_batch':>14}"
+        f"{'search_vectors_batch':>22}"
+    )
+    for n_queries in args.queries:
+        queries = vectors[rng.choice(args.points, n_queries)]
+
+        def loop():
+            return [client.search_vectors(query, limit=args.limit) for query in queries]
+
+        def raw_batch():
+            requests = [
+                SearchRequest(
+                    vector=query.tolist(), limit=args.limit, with_payload=True
+                )
+                for query in queries
+            ]
+            return client.client.search_batch(client.collection_name, requests)
+
+        def batch():
+            return client.search_vectors_batch(queries, limit=args.limit)
+
+        assert [[hit["id"] for hit in hits] for hits in loop()] == [
+            [hit["id"] for hit in hits] for hits in batch()
+        ]
+        timings = [_median_ms(fn, args.repeats) for fn in (loop, raw_batch, batch)]
+        print(
+            f"{n_queries:>8}{timings[0]:>10.1f}{timings[1]:>14.1f}{timings[2]:>22.1f}"
+        )
+    client.delete_collection()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Latency of SearchHandler.batch_search_and_rerank over 1-64 queries.
+
+Each query comes with ``--passages`` retrieved chunks of ~1024 characters,
+as produced by the markdown ingestion. The batch is reranked on one thread
+(``rerank_workers=1``, the original serial loop) and on the worker pool,
+at two ``max_length`` truncation settings.
+
+Run from ``backend/``::
+
+    python -m benchmarks.reranking --offline
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.standin_model import build_standin_reranker, sample_texts
+from src.database_handler.search_handler import SearchHandler
+
+
+def _results(n_queries, n_passages):
+    passages = sample_texts(n_queries * n_passages, n_words=170, seed=3)
+    return [
+        [
+            {
+                "id": q * n_passages + p,
+                "payload": {"text": passages[q * n_passages + p]},
+            }
+            for p in range(n_passages)
+        ]
+        for q in range(n_queries)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--offline", action="store_true", help="random-weight stand-in reranker"
+    )
+    parser.add_argument("--queries", type=int, nargs="+", default=[1, 8, 64])
+    parser.add_argument("--passages", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--max-length", type=int, nargs="+", default=[512, 128])
+    args = parser.parse_args()
+
+    if args.offline:
+        # SearchHandler loads flashrank models from ./models.
+        os.chdir(tempfile.mkdtemp(prefix="reranker-"))
+        build_standin_reranker("models")
+
+    print(
+        f"{'max_len':>8}{'workers':>9}{'queries':>9}{'wall s':>9}"
+        f"{'ms/query':>10}{'pairs/s':>9}"
+    )
+    for max_length in args.max_length:
+        for workers in (1, args.workers):
+            handler = SearchHandler(
+                embedding_handler=None, max_length=max_length, rerank_workers=workers
+            )
+            handler.load_model()
+            handler.search_and_rerank("warm up", _results(1, args.passages)[0])
+            for n_queries in args.queries:
+                queries = sample_texts(n_queries, seed=4)
+                results = _results(n_queries, args.passages)
+                start = time.perf_counter()
+                handler.batch_search_and_rerank(queries, results)
+                elapsed = time.perf_counter() - start
+                print(
+                    f"{max_length:>8}{workers:>9}{n_queries:>9}{elapsed:>9.2f}"
+                    f"{elapsed / n_queries * 1000:>10.1f}"
+                    f"{n_queries * args.passages / elapsed:>9.1f}"
+                )
+            handler.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""Offline stand-ins for the embedding and reranker models of the benchmarks.
+
+Inference cost depends on the architecture and the sequence length, not on
+the weights, so when the Hugging Face hub is unreachable the benchmarks run
+on randomly initialised BERT-base encoders (12 layers, 768 hidden, 3072
+FFN; the size of nomic-embed-text-v1.5 and of the rank-T5-flan encoder)
+with a word-level vocabulary that covers the generated texts. Vectors and
+scores are meaningless; only the timings are.
+"""
+
+import random
+import shutil
+from pathlib import Path
+from typing import List
+
+import torch
+from flashrank.Config import model_file_map
+from onnxruntime.quantization import QuantType, quantize_dynamic
+from sentence_transformers import SentenceTransformer, models
+from transformers import (
+    BertConfig,
+    BertForSequenceClassification,
+    BertModel,
+    BertTokenizerFast,
+)
+
+WORDS = (
+    "forklift battery charger mast lift capacity electric diesel pallet truck "
+    "reach stacker warehouse aisle load centre tyre cushion pneumatic brake "
+    "hydraulic pump motor controller seat operator cabin safety light alarm "
+    "speed travel height fork carriage side shift tilt cylinder chain hose "
+    "service interval warranty price quote delivery lead time spare part "
+    "manual brochure specification model series version weight dimension "
+    "width length turning radius gradient voltage ampere hour lithium lead "
+    "acid the a of to and in for on with by what which how is are can does "
+    "compare best cheapest maximum minimum rated indoor outdoor rough terrain"
+).split()
+SPECIAL_TOKENS = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"]
+
+
+def sample_texts(n: int, n_words: int = 12, seed: int = 0) -> List[str]:
+    """Generate ``n`` distinct pseudo-queries of ``n_words`` words each."""
+    rng = random.Random(seed)
+    return [f"{' '.join(rng.choices(WORDS, k=n_words))} {i}" for i in range(n)]
+
+
+def _save_tokenizer(hf_dir: Path) -> int:
+    """Write a word-level BERT tokenizer; returns the vocabulary size."""
+    hf_dir.mkdir(parents=True, exist_ok=True)
+    digits = [str(i) for i in range(10)]
+    vocab = list(dict.fromkeys(SPECIAL_TOKENS + WORDS + digits))
+    vocab += [f"##{digit}" for digit in digits]
+    (hf_dir / "vocab.txt").write_text("\n".join(vocab) + "\n")
+    tokenizer = BertTokenizerFast(
+        vocab_file=str(hf_dir / "vocab.txt"), model_max_length=512
+    )
+    tokenizer.save_pretrained(hf_dir)
+    return len(vocab)
+
+
+def _bert_config(vocab_size, num_layers, hidden_size, intermediate_size, **kwargs):
+    return BertConfig(
+        vocab_size=vocab_size,
+        hidden_size=hidden_size,
+        num_hidden_layers=num_layers,
+        num_attention_heads=hidden_size // 64,
+        intermediate_size=intermediate_size,
+        **kwargs,
+    )
+
+
+def _export(model, path: Path, output_name: str, quantize: bool):
+    """Export a BERT module to ONNX, optionally int8-quantizing its weights."""
+    example = torch.ones((1, 8), dtype=torch.long)
+    names = ["input_ids", "attention_mask", "token_type_ids", output_name]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in names}
+    if output_name == "logits":
+        dynamic_axes[output_name] = {0: "batch"}
+    fp32_path = path.with_suffix(".fp32.onnx") if quantize else path
+    torch.onnx.export(
+        model.eval(),
+        (example, example, torch.zeros_like(example)),
+        str(fp32_path),
+        input_names=names[:3],
+        output_names=names[3:],
+        dynamic_axes=dynamic_axes,
+        opset_version=17,
+    )
+    if quantize:
+        quantize_dynamic(str(fp32_path), str(path), weight_type=QuantType.QInt8)
+        fp32_path.unlink()
+
+
+def build_standin_model(
+    directory: str,
+    num_layers: int = 12,
+    hidden_size: int = 768,
+    intermediate_size: int = 3072,
+) -> str:
+    """Save a random-weight SentenceTransformer under ``directory``.
+
+    Returns:
+        str: Path loadable with ``SentenceTransformer(path)``
+    """
+    root = Path(directory)
+    model_dir = root / "sentence-transformer"
+    if (model_dir / "modules.json").exists():
+        return str(model_dir)
+    hf_dir = root / "hf"
+    vocab_size = _save_tokenizer(hf_dir)
+    config = _bert_config(vocab_size, num_layers, hidden_size, intermediate_size)
+    BertModel(config).save_pretrained(hf_dir)
+
+    transformer = models.Transformer(str(hf_dir), max_seq_length=512)
+    pooling = models.Pooling(hidden_size, pooling_mode="mean")
+    SentenceTransformer(modules=[transformer, pooling]).save(str(model_dir))
+    return str(model_dir)
+
+
+def export_onnx(model_dir: str, directory: str, quantize: bool = False) -> str:
+    """Export a stand-in model to an ONNX directory fastembed can load.
+
+    Args:
+        model_dir (str): Path returned by build_standin_model
+        directory (str): Output directory
+        quantize (bool): Apply int8 dynamic quantization to the weights
+
+    Returns:
+        str: Directory holding ``model.onnx`` and the tokenizer files
+    """
+    out_dir = Path(directory)
+    if (out_dir / "model.onnx").exists():
+        return str(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    hf_dir = Path(model_dir).parent / "hf"
+    for path in hf_dir.iterdir():
+        if path.suffix != ".safetensors":
+            shutil.copy(path, out_dir / path.name)
+    model = BertModel.from_pretrained(hf_dir)
+    _export(model, out_dir / "model.onnx", "last_hidden_state", quantize)
+    return str(out_dir)
+
+
+def build_standin_reranker(
+    directory: str,
+    model_name: str = "rank-T5-flan",
+    num_layers: int = 12,
+    hidden_size: int = 768,
+    intermediate_size: int = 3072,
+) -> str:
+    """Lay out a random-weight int8 cross-encoder as a flashrank model.
+
+    Flashrank only downloads a model when ``<directory>/<model_name>`` is
+    missing, so a Ranker with ``cache_dir=directory`` loads this instead.
+
+    Returns:
+        str: The flashrank cache directory
+    """
+    model_dir = Path(directory) / model_name
+    model_path = model_dir / model_file_map[model_name]
+    if model_path.exists():
+        return directory
+    vocab_size = _save_tokenizer(model_dir)
+    config = _bert_config(
+        vocab_size, num_layers, hidden_size, intermediate_size, num_labels=1
+    )
+    model = BertForSequenceClassification(config)
+    config.save_pretrained(model_dir)
+    _export(model, model_path, "logits", quantize=True)
+    return directory
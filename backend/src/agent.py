@@ -1,31 +1,73 @@
-from typing import List
+from typing import AsyncIterator, List
 
 from langchain.output_parsers import PydanticOutputParser
+from langchain_core.messages import AIMessageChunk, ToolMessage
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.tools import tool
+from langchain_core.tools import StructuredTool, tool
 from langchain_openai import ChatOpenAI
 from langgraph.prebuilt import create_react_agent
 from pydantic import BaseModel
 
 from src.app_config import app_config
 from src.prompts import SPECIFICATION_PARSER_PROMPT
-from src.schema import ForkliftProduct, ListForkliftProduct
 from src.prompts import SYSTEM_PROMPT
 from src.database_handler.qdrant_connector import QdrantDBClient
 from src.schema import UserQuestion, ConversationInfor, Message, UserThread
 import re
-from src.database_handler.mongodb_handler import MemoryHandler
-from src.tools.news import get_news_about_specific_topic, get_latest_general_news
+from src.database_handler.async_mongodb_handler import AsyncMemoryHandler
+from src.database_handler.mongodb_handler import CachedMemoryHandler
+from src.tools.news import (
+    aget_latest_general_news,
+    aget_news_about_specific_topic,
+    get_latest_general_news,
+    get_news_about_specific_topic,
+)
+from src.tools.retrieval import build_brochure_search_tool
+
+HISTORY_WINDOW = 6
+
 
 class Agent:
     def __init__(self):
-        self.database_handler = QdrantDBClient(collection_name=app_config.COLLECTION_NAME_QDRANT)
+        self.database_handler = QdrantDBClient(
+            collection_name=app_config.COLLECTION_NAME_QDRANT
+        )
         self.database_handler.connect_to_database()
-        self.memory_handler = MemoryHandler(db_name="test", collection_name=app_config.COLLECTION_NAME_MONGO)
+        # Warm the query-path models in the background so the first brochure
+        # search is not spent loading them; PRELOAD_MODELS=false opts out.
+        if app_config.PRELOAD_MODELS is not False:
+            self.database_handler.preload_models(background=True)
+        # The async request path reads cache misses through motor; writes
+        # from both paths go through the same write-behind queue.
+        async_memory_handler = AsyncMemoryHandler(
+            db_name="test",
+            collection_name=app_config.COLLECTION_NAME_MONGO,
+            archive_collection_name=app_config.COLLECTION_NAME_MONGO_ARCHIVE,
+        )
+        async_memory_handler.connect_to_database()
+        self.memory_handler = CachedMemoryHandler(
+            db_name="test",
+            collection_name=app_config.COLLECTION_NAME_MONGO,
+            archive_collection_name=app_config.COLLECTION_NAME_MONGO_ARCHIVE,
+            async_handler=async_memory_handler,
+        )
         self.memory_handler.connect_to_database()
+        self.memory_handler.create_indexes()
         self.llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
-        self.tools = [get_news_about_specific_topic, get_latest_general_news]
+        self.tools = [
+            StructuredTool.from_function(
+                func=get_news_about_specific_topic,
+                coroutine=aget_news_about_specific_topic,
+            ),
+            StructuredTool.from_function(
+                func=get_latest_general_news,
+                coroutine=aget_latest_general_news,
+            ),
+            build_brochure_search_tool(
+                self.database_handler, workers=app_config.RETRIEVAL_WORKERS or 8
+            ),
+        ]
         self.react_agent = create_react_agent(
             self.llm, tools=self.tools, prompt=SYSTEM_PROMPT
         )
@@ -36,35 +78,132 @@ class Agent:
         return res
 
     def print_stream(self, user_question: UserQuestion):
-        self.question = user_question.question
         messages = self._get_chat_history(user_question.user_thread)
         messages.append({"role": "user", "content": user_question.question})
+        message = None
         for s in self.react_agent.stream({"messages": messages}, stream_mode="values"):
             message = s["messages"][-1]
             if isinstance(message, tuple):
                 print(message)
             else:
                 message.pretty_print()
-        self._save_conversation(
-            user_question.user_thread, user_question.question, message.content
-        )
+        if message is not None:
+            self._save_conversation(
+                user_question.user_thread, user_question.question, message.content
+            )
         return message.content if message else ""
 
-    def _get_chat_history(self, user_thread: UserThread):
-        chat_history = self.memory_handler.retrieve_conversation(user_thread)
+    async def astream(self, user_question: UserQuestion) -> AsyncIterator:
+        """Stream the agent state without blocking the event loop.
+
+        Yields the last message of every intermediate state and persists the
+        conversation once the run is finished.
+        """
+        messages = await self._aget_chat_history(user_question.user_thread)
+        messages.append({"role": "user", "content": user_question.question})
+        message = None
+        async for s in self.react_agent.astream(
+            {"messages": messages}, stream_mode="values"
+        ):
+            message = s["messages"][-1]
+            yield message
+        if message is not None:
+            await self._asave_conversation(
+                user_question.user_thread, user_question.question, message.content
+            )
+
+    async def ainvoke(self, user_question: UserQuestion) -> str:
+        """Async counterpart of print_stream, returning the final answer."""
+        message = None
+        async for message in self.astream(user_question):
+            pass
+        return message.content if message else ""
+
+    async def astream_events(self, user_question: UserQuestion) -> AsyncIterator[dict]:
+        """Stream token deltas and tool-call events for a single question.
+
+        Yields dicts with an ``event`` name and ``data`` payload: ``token`` for
+        LLM content deltas, ``tool_call`` for tool invocations requested by the
+        model, ``tool_result`` for tool outputs and a final ``done`` event with
+        the full answer. The conversation is persisted once, after the run.
+        """
+        messages = await self._aget_chat_history(user_question.user_thread)
+        messages.append({"role": "user", "content": user_question.question})
+        final_message = None
+        async for mode, payload in self.react_agent.astream(
+            {"messages": messages}, stream_mode=["messages", "values"]
+        ):
+            if mode == "values":
+                final_message = payload["messages"][-1]
+                continue
+            chunk, _metadata = payload
+            if isinstance(chunk, AIMessageChunk):
+                if chunk.content:
+                    yield {"event": "token", "data": {"content": chunk.content}}
+                for tool_call in chunk.tool_call_chunks:
+                    yield {
+                        "event": "tool_call",
+                        "data": {
+                            "id": tool_call.get("id"),
+                            "name": tool_call.get("name"),
+                            "args": tool_call.get("args"),
+                        },
+                    }
+            elif isinstance(chunk, ToolMessage):
+                yield {
+                    "event": "tool_result",
+                    "data": {"name": chunk.name, "tool_call_id": chunk.tool_call_id},
+                }
+        answer = final_message.content if final_message else ""
+        await self._asave_conversation(
+            user_question.user_thread, user_question.question, answer
+        )
+        yield {"event": "done", "data": {"message": answer}}
+
+    @staticmethod
+    def _history_messages(chat_history) -> List[dict]:
         if not chat_history or "messages" not in chat_history:
             return []
         messages = chat_history["messages"]
         return [
-            {"role": msg["role"], "content": msg["content"]} for msg in messages[-6:]
+            {"role": msg["role"], "content": msg["content"]}
+            for msg in messages[-HISTORY_WINDOW:]
         ]
 
-    def _save_conversation(self, user_thread: UserThread, question: str, answer: str):
-        conversation = ConversationInfor(
+    @staticmethod
+    def _conversation_turn(
+        user_thread: UserThread, question: str, answer: str
+    ) -> ConversationInfor:
+        return ConversationInfor(
             user_thread_infor=user_thread,
             messages=[
                 Message(role="user", content=question),
                 Message(role="assistant", content=answer),
             ],
         )
-        self.memory_handler.insert_or_update_conversation(conversation)
\ No newline at end of file
+
+    def _get_chat_history(self, user_thread: UserThread):
+        return self._history_messages(
+            self.memory_handler.retrieve_conversation(
+                user_thread, last_k=HISTORY_WINDOW
+            )
+        )
+
+    def _save_conversation(self, user_thread: UserThread, question: str, answer: str):
+        self.memory_handler.insert_or_update_conversation(
+            self._conversation_turn(user_thread, question, answer)
+        )
+
+    async def _aget_chat_history(self, user_thread: UserThread):
+        return self._history_messages(
+            await self.memory_handler.aretrieve_conversation(
+                user_thread, last_k=HISTORY_WINDOW
+            )
+        )
+
+    async def _asave_conversation(
+        self, user_thread: UserThread, question: str, answer: str
+    ):
+        await self.memory_handler.ainsert_or_update_conversation(
+            self._conversation_turn(user_thread, question, answer)
+        )
@@ -11,6 +11,7 @@ class AppConfig(BaseSettings):
     API_KEY_QDRANT: Optional[str] = None
     COLLECTION_NAME_QDRANT: Optional[str] = None
     COLLECTION_NAME_MONGO: Optional[str] = None
+    COLLECTION_NAME_MONGO_ARCHIVE: Optional[str] = None
     DATA_PATH: Optional[str] = None
     OPENAI_MODEL_NAME: Optional[str] = None
     QDRANT_URL: Optional[str] = None
@@ -19,6 +20,16 @@ class AppConfig(BaseSettings):
     REDDIT_USER_AGENT: Optional[str] = None
     OPENAI_ENGINE: Optional[str] = None
     EMBEDDING_MODEL: Optional[str] = None
+    EMBEDDING_BACKEND: Optional[str] = None
+    EMBEDDING_DIM: Optional[int] = None
+    EMBEDDING_CACHE_DIR: Optional[str] = None
+    EMBEDDING_MICRO_BATCHING: Optional[bool] = None
+    HYBRID_SEARCH: Optional[bool] = None
+    SPARSE_EMBEDDING_MODEL: Optional[str] = None
+    RERANK_MAX_LENGTH: Optional[int] = None
+    RERANK_WORKERS: Optional[int] = None
+    RETRIEVAL_WORKERS: Optional[int] = None
+    PRELOAD_MODELS: Optional[bool] = None
     NEWS_API_KEY: Optional[str] = None
     REDDIT_CLIENT_ID: Optional[str] = None
     REDDIT_CLIENT_SECRET: Optional[str] = None
@@ -50,6 +61,15 @@ class AppConfig(BaseSettings):
     QDRANT_URL: Optional[str] = None
     QDRANT_API_KEY: Optional[str] = None
     QDRANT_COLLECTION_NAME: Optional[str] = None
+    QDRANT_PREFER_GRPC: Optional[bool] = None
+    QDRANT_GRPC_PORT: Optional[int] = None
+    QDRANT_TIMEOUT: Optional[int] = None
+    QDRANT_MAX_RETRIES: Optional[int] = None
+    QDRANT_QUANTIZATION: Optional[str] = None
+    QDRANT_ON_DISK: Optional[bool] = None
+    QDRANT_HNSW_M: Optional[int] = None
+    QDRANT_HNSW_EF_CONSTRUCT: Optional[int] = None
+    QDRANT_OVERSAMPLING: Optional[float] = None
     DB_NAME: Optional[str] = None
     DB_USER: Optional[str] = None
     DB_PASS: Optional[str] = None
@@ -59,6 +79,8 @@ class AppConfig(BaseSettings):
     AWS_SECRET_ACCESS_KEY: Optional[str] = None
     AWS_REGION: Optional[str] = None
     AWS_BUCKET_NAME: Optional[str] = None
+    AWS_MAX_POOL_CONNECTIONS: Optional[int] = None
+    AWS_MAX_ATTEMPTS: Optional[int] = None
     MONGO_INITDB_ROOT_PASSWORD: Optional[str] = None
     MONGO_INITDB_ROOT_USERNAME: Optional[str] = None
     MONGO_PUBLIC_URL: Optional[str] = None
@@ -74,5 +96,6 @@ class AppConfig(BaseSettings):
     MONGO_COLLECTION_NAME: Optional[str] = None
     NEWSDATA_API: Optional[str] = None
 
+
 # Initialize the configuration
 app_config = AppConfig()
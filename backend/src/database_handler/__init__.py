@@ -1,6 +1,19 @@
-from .document_parser import DocumentParser
-from .embedding_handler import EmbeddingHandler
-from .qdrant_connector import QdrantDBClient
-from .search_handler import SearchHandler
+import importlib
 
-__all__ = ["QdrantDBClient", "DocumentParser", "EmbeddingHandler", "SearchHandler"]
+# Exports are imported on first access, so light modules such as point_ids
+# can be used without loading the parsing and model dependencies.
+_EXPORTS = {
+    "QdrantDBClient": ".qdrant_connector",
+    "DocumentParser": ".document_parser",
+    "EmbeddingHandler": ".embedding_handler",
+    "LocalVectorStore": ".local_vector_store",
+    "SearchHandler": ".search_handler",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
@@ -0,0 +1,331 @@
+import atexit
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from src.schema import ConversationInfor, UserThread
+
+from .mongodb_handler import ConversationDocumentMixin, build_mongo_uri
+
+
+class AsyncMongoDBHandler:
+    def __init__(
+        self,
+        db_name: str,
+        collection_name: str,
+        max_pool_size: int = 100,
+        min_pool_size: int = 0,
+        max_idle_time_ms: Optional[int] = None,
+        server_selection_timeout_ms: int = 5000,
+        connect_timeout_ms: int = 5000,
+        socket_timeout_ms: Optional[int] = None,
+    ):
+        """Initialize an async MongoDB handler backed by motor.
+
+        Args:
+            db_name (str): MongoDB database name
+            collection_name (str): Collection to operate on
+            max_pool_size (int): Maximum connections in the client pool
+            min_pool_size (int): Connections kept open when idle
+            max_idle_time_ms (Optional[int]): Close pooled connections idle longer
+            server_selection_timeout_ms (int): Time to wait for a usable server
+            connect_timeout_ms (int): Socket connect timeout
+            socket_timeout_ms (Optional[int]): Per-operation socket timeout
+        """
+        self.client = None
+        self.db = None
+        self.collection = None
+        self.db_name = db_name
+        self.collection_name = collection_name
+        self.client_options = {
+            "maxPoolSize": max_pool_size,
+            "minPoolSize": min_pool_size,
+            "maxIdleTimeMS": max_idle_time_ms,
+            "serverSelectionTimeoutMS": server_selection_timeout_ms,
+            "connectTimeoutMS": connect_timeout_ms,
+            "socketTimeoutMS": socket_timeout_ms,
+        }
+        atexit.register(self.close_connection)
+
+    def connect_to_database(self):
+        """Create the pooled motor client.
+
+        Motor connects lazily, so no ``ping`` round trip is issued here; the
+        pool's server monitoring handles reconnects.
+        """
+        try:
+            if not self.client:
+                self.client = AsyncIOMotorClient(
+                    build_mongo_uri(),
+                    **{k: v for k, v in self.client_options.items() if v is not None},
+                )
+                self.db = self.client[self.db_name]
+                self.collection = self.db[self.collection_name]
+                print("MongoDB async connection established.")
+        except Exception as e:
+            print(f"❌ MongoDB connection error: {e}")
+            self.close_connection()
+
+    async def insert_one(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Insert a single document into MongoDB."""
+        if self.collection is None:
+            return {"status": "error", "message": "No database connection"}
+
+        try:
+            result = await self.collection.insert_one(data)
+            inserted_doc = await self.collection.find_one({"_id": result.inserted_id})
+            print("✅ Document inserted successfully.")
+            return {
+                "status": "success",
+                "message": "Document inserted successfully",
+                "data": inserted_doc,
+            }
+        except Exception as e:
+            print(f"❌ Error inserting document: {e}")
+            return {"status": "error", "message": str(e)}
+
+    async def insert_many(self, data_list: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Insert multiple documents into MongoDB."""
+        if self.collection is None:
+            return {"status": "error", "message": "No database connection"}
+
+        try:
+            result = await self.collection.insert_many(data_list)
+            print(f"✅ {len(result.inserted_ids)} documents inserted successfully.")
+            return {
+                "status": "success",
+                "message": f"{len(result.inserted_ids)} documents inserted successfully",
+                "inserted_ids": result.inserted_ids,
+            }
+        except Exception as e:
+            print(f"❌ Error inserting documents: {e}")
+            return {"status": "error", "message": str(e)}
+
+    async def find_one(
+        self, query: Dict[str, Any], projection: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Find a single document in MongoDB."""
+        if self.collection is None:
+            return None
+
+        try:
+            return await self.collection.find_one(query, projection)
+        except Exception as e:
+            print(f"❌ Error finding document: {e}")
+            return None
+
+    async def find_many(
+        self,
+        query: Dict[str, Any],
+        limit: int = 0,
+        batch_size: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream documents matching the query from the server cursor.
+
+        Documents are yielded as each cursor batch arrives instead of being
+        collected into a list.
+        """
+        if self.collection is None:
+            return
+
+        try:
+            cursor = self.collection.find(query)
+            if limit > 0:
+                cursor = cursor.limit(limit)
+            if batch_size:
+                cursor = cursor.batch_size(batch_size)
+            async for document in cursor:
+                yield document
+        except Exception as e:
+            print(f"❌ Error finding documents: {e}")
+
+    async def update_one(
+        self, query: Dict[str, Any], update_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Update a single document in MongoDB."""
+        if self.collection is None:
+            return {"status": "error", "message": "No database connection"}
+
+        try:
+            result = await self.collection.update_one(query, {"$set": update_data})
+            if result.modified_count > 0:
+                print("✅ Document updated successfully.")
+                return {
+                    "status": "success",
+                    "message": "Document updated successfully",
+                    "modified_count": result.modified_count,
+                }
+            else:
+                print("ℹ️ No document was updated.")
+                return {
+                    "status": "info",
+                    "message": "No document was updated",
+                    "modified_count": 0,
+                }
+        except Exception as e:
+            print(f"❌ Error updating document: {e}")
+            return {"status": "error", "message": str(e)}
+
+    async def delete_one(self, query: Dict[str, Any]) -> Dict[str, Any]:
+        """Delete a single document from MongoDB."""
+        if self.collection is None:
+            return {"status": "error", "message": "No database connection"}
+
+        try:
+            result = await self.collection.delete_one(query)
+            if result.deleted_count > 0:
+                print("✅ Document deleted successfully.")
+                return {
+                    "status": "success",
+                    "message": "Document deleted successfully",
+                    "deleted_count": result.deleted_count,
+                }
+            else:
+                print("ℹ️ No document was deleted.")
+                return {
+                    "status": "info",
+                    "message": "No document was deleted",
+                    "deleted_count": 0,
+                }
+        except Exception as e:
+            print(f"❌ Error deleting document: {e}")
+            return {"status": "error", "message": str(e)}
+
+    async def delete_many(self, query: Dict[str, Any]) -> Dict[str, Any]:
+        """Delete multiple documents from MongoDB."""
+        if self.collection is None:
+            return {"status": "error", "message": "No database connection"}
+
+        try:
+            result = await self.collection.delete_many(query)
+            print(f"✅ {result.deleted_count} documents deleted successfully.")
+            return {
+                "status": "success",
+                "message": f"{result.deleted_count} documents deleted successfully",
+                "deleted_count": result.deleted_count,
+            }
+        except Exception as e:
+            print(f"❌ Error deleting documents: {e}")
+            return {"status": "error", "message": str(e)}
+
+    def close_connection(self):
+        """Close the MongoDB connection pool."""
+        try:
+            if self.client:
+                self.client.close()
+                self.client = None
+                self.db = None
+                self.collection = None
+                print("🔒 MongoDB async connection closed.")
+        except Exception as e:
+            print(f"⚠️ Error closing MongoDB connection: {e}")
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        self.connect_to_database()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        self.close_connection()
+
+
+class AsyncMemoryHandler(ConversationDocumentMixin, AsyncMongoDBHandler):
+    def __init__(
+        self,
+        db_name: str,
+        collection_name: str,
+        max_messages: int = 50,
+        archive_collection_name: Optional[str] = None,
+        archive_bucket_size: int = 200,
+        **client_options: Any,
+    ):
+        """Async counterpart of MemoryHandler writing the same documents.
+
+        Args:
+            db_name (str): MongoDB database name
+            collection_name (str): Collection holding the live conversations
+            max_messages (int): Messages kept on the live document
+            archive_collection_name (Optional[str]): Optional archive bucket collection
+            archive_bucket_size (int): Messages per archive bucket before a new
+                one is started
+            **client_options: Pool and timeout options for AsyncMongoDBHandler
+        """
+        super().__init__(db_name, collection_name, **client_options)
+        self.max_messages = max_messages
+        self.archive_collection_name = archive_collection_name
+        self.archive_bucket_size = archive_bucket_size
+
+    @property
+    def archive_collection(self):
+        if self.db is None or not self.archive_collection_name:
+            return None
+        return self.db[self.archive_collection_name]
+
+    async def create_indexes(self):
+        """Create the compound thread indexes used by every memory lookup."""
+        if self.collection is None:
+            print("No database connection")
+            return
+
+        thread_key = [("user_id", 1), ("thread_id", 1), ("agent_name", 1)]
+        await self.collection.create_index(thread_key, name="user_thread_agent")
+        if self.archive_collection is not None:
+            await self.archive_collection.create_index(
+                thread_key + [("count", 1)], name="user_thread_agent_bucket"
+            )
+        print("MongoDB memory indexes ensured.")
+
+    async def clear_conversation(self, thread_infor: UserThread) -> bool:
+        """Clear a specific conversation."""
+        if self.collection is None:
+            print("No database connection")
+            return False
+
+        result = await self.collection.delete_one(
+            {"user_id": thread_infor.user_id, "thread_id": thread_infor.thread_id}
+        )
+        return result.deleted_count > 0
+
+    async def insert_or_update_conversation(
+        self, conversation_infor: ConversationInfor
+    ):
+        if self.collection is None:
+            print("No database connection")
+            return
+
+        if not conversation_infor.messages:
+            print("No messages provided. Skipping update.")
+            return
+
+        messages_as_dicts = self._messages_as_dicts(conversation_infor.messages)
+        thread_filter = self._thread_filter(conversation_infor.user_thread_infor)
+        await self.collection.update_one(
+            thread_filter,
+            self._conversation_update(thread_filter, messages_as_dicts),
+            upsert=True,
+        )
+        if self.archive_collection is not None:
+            bucket_filter, update = self._archive_update(
+                thread_filter, messages_as_dicts
+            )
+            await self.archive_collection.update_one(bucket_filter, update, upsert=True)
+
+    async def retrieve_conversation(
+        self, thread_infor: UserThread, last_k: Optional[int] = None
+    ) -> ConversationInfor:
+        """Fetch a conversation, optionally only its last ``last_k`` messages."""
+        if self.collection is None:
+            print("No database connection")
+            return {}
+
+        projection = None
+        if last_k is not None:
+            projection = {"messages": {"$slice": -last_k}}
+        conversation = await self.collection.find_one(
+            self._thread_filter(thread_infor), projection
+        )
+        if conversation:
+            conversation["_id"] = str(conversation["_id"])
+            return conversation
+        return {}
@@ -7,6 +7,8 @@ from typing import List
 from sentence_transformers import SentenceTransformer
 import numpy as np
 
+from src.database_handler.model_registry import model_registry
+
 
 class ChunkingStrategy(Protocol):
     """Protocol defining the interface for document chunking strategies."""
@@ -221,9 +223,16 @@ class SemanticChunkingStrategy:
             model_name (str): Name of the sentence transformer model.
             similarity_threshold (float): Min cosine similarity to continue chunking together.
         """
-        self.model = SentenceTransformer(model_name)
+        self.model_name = model_name
         self.similarity_threshold = similarity_threshold
 
+    @property
+    def model(self) -> SentenceTransformer:
+        return model_registry.get_or_load(
+            f"sentence-transformers/{self.model_name}",
+            lambda: SentenceTransformer(self.model_name),
+        )
+
     def chunk_text(self, text: str, chunk_size: int, chunk_overlap: int) -> List[str]:
         # Split text into sentences
         sentences = [s.strip() for s in re.split(r"(?<=[.!?])\s+", text) if s.strip()]
@@ -0,0 +1,160 @@
+import logging
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import boto3
+import grpc
+from botocore.config import Config
+from qdrant_client import QdrantClient as QClient
+from qdrant_client.http.exceptions import ResponseHandlingException, UnexpectedResponse
+
+from src.app_config import app_config
+
+_RETRYABLE_STATUS = {429, 502, 503, 504}
+_RETRYABLE_GRPC = {
+    grpc.StatusCode.UNAVAILABLE,
+    grpc.StatusCode.DEADLINE_EXCEEDED,
+    grpc.StatusCode.RESOURCE_EXHAUSTED,
+}
+
+
+def is_transient_error(error: Exception) -> bool:
+    """Whether a Qdrant call failed for a reason worth retrying."""
+    if isinstance(error, (ResponseHandlingException, ConnectionError, TimeoutError)):
+        return True
+    if isinstance(error, UnexpectedResponse):
+        return error.status_code in _RETRYABLE_STATUS
+    if isinstance(error, grpc.RpcError):
+        return error.code() in _RETRYABLE_GRPC
+    return False
+
+
+def retry_with_backoff(
+    fn: Callable[..., Any],
+    *args,
+    max_retries: int = 3,
+    base_delay: float = 0.2,
+    max_delay: float = 5.0,
+    **kwargs,
+) -> Any:
+    """Call ``fn`` and retry transient failures with exponential backoff.
+
+    Args:
+        fn (Callable): Function to call with ``args``/``kwargs``
+        max_retries (int): Retries after the first attempt
+        base_delay (float): Delay before the first retry, in seconds
+        max_delay (float): Upper bound of a single delay, in seconds
+
+    Returns:
+        Any: The return value of ``fn``
+    """
+    attempt = 0
+    while True:
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            if attempt >= max_retries or not is_transient_error(e):
+                raise
+            # Full jitter keeps concurrent callers from retrying in lockstep.
+            delay = random.uniform(0, min(max_delay, base_delay * 2**attempt))
+            attempt += 1
+            logging.warning(
+                f"⚠️ Transient Qdrant error ({e}); retry {attempt}/{max_retries} "
+                f"in {delay:.2f}s"
+            )
+            time.sleep(delay)
+
+
+class QdrantClientPool:
+    """Process-wide, reference-counted Qdrant clients.
+
+    Clients are keyed by their connection settings and shared by every
+    QdrantDBClient using the same settings, so HTTP keep-alive connections
+    and gRPC channels are reused instead of being opened per handler. A
+    client is closed when its last user releases it.
+    """
+
+    def __init__(self):
+        self._clients: Dict[Tuple, QClient] = {}
+        self._refs: Dict[Tuple, int] = {}
+        self._lock = threading.Lock()
+
+    def acquire(
+        self,
+        url: Optional[str],
+        api_key: Optional[str],
+        prefer_grpc: bool = False,
+        grpc_port: int = 6334,
+        timeout: Optional[int] = None,
+    ) -> Tuple[Tuple, QClient]:
+        """Return ``(key, client)`` for the given settings, creating it once."""
+        key = (url, api_key, prefer_grpc, grpc_port, timeout)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = QClient(
+                    url=url,
+                    api_key=api_key,
+                    prefer_grpc=prefer_grpc,
+                    grpc_port=grpc_port,
+                    timeout=timeout,
+                )
+                self._clients[key] = client
+                self._refs[key] = 0
+                logging.info(
+                    f"🔌 Opened Qdrant {'gRPC' if prefer_grpc else 'HTTP'} client"
+                )
+            self._refs[key] += 1
+            return key, client
+
+    def release(self, key: Tuple):
+        """Drop one reference and close the client when none remain."""
+        with self._lock:
+            if key not in self._refs:
+                return
+            self._refs[key] -= 1
+            if self._refs[key] > 0:
+                return
+            client = self._clients.pop(key)
+            del self._refs[key]
+        client.close()
+
+    def close_all(self):
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+            self._refs.clear()
+        for client in clients:
+            client.close()
+
+
+qdrant_client_pool = QdrantClientPool()
+
+_s3_client = None
+_s3_lock = threading.Lock()
+
+
+def get_s3_client():
+    """Shared boto3 S3 client (thread-safe, pooled connections, retries)."""
+    global _s3_client
+    if _s3_client is None:
+        with _s3_lock:
+            if _s3_client is None:
+                _s3_client = boto3.client(
+                    "s3",
+                    aws_access_key_id=app_config.AWS_ACCESS_KEY_ID,
+                    aws_secret_access_key=app_config.AWS_SECRET_ACCESS_KEY,
+                    region_name=app_config.AWS_REGION,
+                    config=Config(
+                        max_pool_connections=app_config.AWS_MAX_POOL_CONNECTIONS or 20,
+                        connect_timeout=5,
+                        read_timeout=60,
+                        retries={
+                            "max_attempts": app_config.AWS_MAX_ATTEMPTS or 5,
+                            "mode": "adaptive",
+                        },
+                    ),
+                )
+    return _s3_client
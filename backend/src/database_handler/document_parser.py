@@ -14,7 +14,8 @@ from tabulate import tabulate
 from src.database_handler.image_processor import ImageProcessingAgent
 from tqdm import tqdm
 from src.database_handler.chunk_document import ChunkDocument, SemanticChunkingStrategy
-import boto3
+from src.database_handler.connections import get_s3_client
+from src.database_handler.point_ids import hash_point_id
 from src.app_config import app_config
 from datetime import datetime
 import hashlib
@@ -42,8 +43,7 @@ class DocumentParser:
         identifier = filename
         if row_index is not None:
             identifier += f"_row_{row_index}"
-        hash_object = hashlib.md5(identifier.encode())
-        return int(hash_object.hexdigest(), 16) % 1000000
+        return hash_point_id(identifier)
 
     # def random_filename(self, ext):
     #     return f"{uuid.uuid4().hex[:12]}{ext}"
@@ -73,13 +73,7 @@ class DocumentParser:
         ext = os.path.splitext(image_path)[1]
         short_name = self.random_filename(ext)
         object_key = f"uploads/{today}/{short_name}"
-        s3 = boto3.client(
-            "s3",
-            aws_access_key_id=app_config.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=app_config.AWS_SECRET_ACCESS_KEY,
-            region_name=app_config.AWS_REGION,
-        )
-        s3.upload_file(
+        get_s3_client().upload_file(
             image_path,
             app_config.AWS_BUCKET_NAME,
             object_key,
@@ -0,0 +1,111 @@
+from typing import Any, List, Protocol
+
+import numpy as np
+from fastembed import TextEmbedding
+from sentence_transformers import SentenceTransformer
+
+from .model_registry import model_registry
+
+
+class EmbeddingBackend(Protocol):
+    """Protocol defining the interface for embedding inference backends."""
+
+    name: str
+
+    @property
+    def model(self) -> Any:
+        """The underlying (lazily loaded) model object."""
+        ...
+
+    def encode(self, texts: List[str], batch_size: int, normalize: bool) -> np.ndarray:
+        """Encode texts into a float32 ``(n, dim)`` matrix.
+
+        Args:
+            texts (List[str]): Texts to embed
+            batch_size (int): Inference batch size
+            normalize (bool): L2-normalise the output vectors
+
+        Returns:
+            np.ndarray: Embedding matrix
+        """
+        ...
+
+
+def _l2_normalize(embeddings: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return embeddings / np.maximum(norms, 1e-12)
+
+
+class SentenceTransformerBackend:
+    """SentenceTransformer inference on PyTorch."""
+
+    def __init__(self, model_name: str, name: str = "torch"):
+        self.model_name = model_name
+        self.name = name
+
+    def _load(self) -> SentenceTransformer:
+        return SentenceTransformer(
+            self.model_name, trust_remote_code=True, cache_folder="./models"
+        )
+
+    @property
+    def model(self) -> SentenceTransformer:
+        return model_registry.get_or_load(
+            f"sentence-transformers/{self.model_name}", self._load
+        )
+
+    def encode(self, texts: List[str], batch_size: int, normalize: bool) -> np.ndarray:
+        embeddings = self.model.encode(
+            texts,
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=normalize,
+        )
+        return np.asarray(embeddings, dtype=np.float32)
+
+
+class FastEmbedBackend:
+    """fastembed (ONNX Runtime) inference, optionally on a quantized model."""
+
+    def __init__(self, model_name: str, name: str = "fastembed"):
+        self.model_name = model_name
+        self.name = name
+
+    def _load(self) -> TextEmbedding:
+        return TextEmbedding(model_name=self.model_name, cache_dir="./models")
+
+    @property
+    def model(self) -> TextEmbedding:
+        return model_registry.get_or_load(f"fastembed/{self.model_name}", self._load)
+
+    def encode(self, texts: List[str], batch_size: int, normalize: bool) -> np.ndarray:
+        embeddings = np.asarray(
+            list(self.model.embed(texts, batch_size=batch_size)), dtype=np.float32
+        )
+        return _l2_normalize(embeddings) if normalize else embeddings
+
+
+EMBEDDING_BACKENDS = ("torch", "fastembed", "fastembed-int8")
+
+
+def create_embedding_backend(name: str, model_name: str) -> EmbeddingBackend:
+    """Build an embedding backend by config name.
+
+    Args:
+        name (str): One of ``torch``, ``fastembed`` (ONNX Runtime) or
+            ``fastembed-int8`` (int8-quantized ONNX model)
+        model_name (str): Hugging Face model id
+
+    Returns:
+        EmbeddingBackend: The configured backend
+    """
+    if name == "torch":
+        return SentenceTransformerBackend(model_name)
+    if name == "fastembed":
+        return FastEmbedBackend(model_name, name=name)
+    if name == "fastembed-int8":
+        # fastembed publishes quantized variants under a "-Q" suffix.
+        return FastEmbedBackend(f"{model_name}-Q", name=name)
+    raise ValueError(
+        f"Unknown embedding backend '{name}', expected one of {EMBEDDING_BACKENDS}"
+    )
@@ -0,0 +1,116 @@
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class EmbeddingBatcher:
+    """Micro-batching dispatcher for concurrent single-text embedding calls.
+
+    Callers submit one text each; a worker thread collects requests for up
+    to ``max_wait_ms`` (or until ``max_batch_size`` is reached), runs one
+    ``encode_fn`` call for the whole batch and resolves every caller's
+    future with its own row.
+    """
+
+    def __init__(
+        self,
+        encode_fn: Callable[[List[str]], Sequence[np.ndarray]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+    ):
+        """
+        Args:
+            encode_fn (Callable): Batch encoder, e.g. ``model.encode``
+            max_batch_size (int): Maximum texts per encode call
+            max_wait_ms (float): How long to wait for more requests after
+                the first one arrives
+        """
+        self.encode_fn = encode_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue: "queue.Queue[Tuple[str, Future]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._closed = False
+
+    def _ensure_worker(self):
+        if self._worker is not None:
+            return
+        with self._start_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="embedding-batcher", daemon=True
+                )
+                self._worker.start()
+
+    def submit(self, text: str) -> Future:
+        """Queue a text and return a future resolving to its embedding."""
+        if self._closed:
+            raise RuntimeError("EmbeddingBatcher is closed")
+        self._ensure_worker()
+        future: Future = Future()
+        self._queue.put((text, future))
+        return future
+
+    def embed(self, text: str) -> np.ndarray:
+        """Blocking single-text embedding through the shared batch."""
+        return self.submit(text).result()
+
+    async def aembed(self, text: str) -> np.ndarray:
+        """Awaitable single-text embedding through the shared batch."""
+        return await asyncio.wrap_future(self.submit(text))
+
+    def _collect(self) -> List[Tuple[str, Future]]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            collected = self._collect()
+            # A None future is the close() sentinel.
+            stop = any(future is None for _, future in collected)
+            # Claim each future; those cancelled while queued are dropped so
+            # they are neither encoded nor resolved.
+            batch = [
+                (text, future)
+                for text, future in collected
+                if future is not None and future.set_running_or_notify_cancel()
+            ]
+            if batch:
+                self._encode_batch(batch)
+            if stop:
+                return
+
+    def _encode_batch(self, batch: List[Tuple[str, Future]]):
+        futures = [future for _, future in batch]
+        try:
+            embeddings = self.encode_fn([text for text, _ in batch])
+            for future, embedding in zip(futures, embeddings):
+                if not future.done():
+                    future.set_result(embedding)
+        except Exception as e:
+            logging.error(f"❌ Batched embedding error: {e}")
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+
+    def close(self):
+        """Stop the worker after the already queued requests are served."""
+        self._closed = True
+        if self._worker is not None:
+            self._queue.put(("", None))
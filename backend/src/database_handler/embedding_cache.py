@@ -0,0 +1,261 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+
+def text_hash(text: str) -> str:
+    """Content hash used as the cache key for a text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class DiskEmbeddingStore:
+    """Append-only on-disk embedding store read through a memory map.
+
+    Vectors are appended as raw float32 rows to ``vectors.f32`` and
+    ``key<TAB>row`` lines to ``keys.txt``; lookups slice a ``np.memmap`` of
+    the vector file, so the store can be much larger than RAM. Appends are
+    serialized with an exclusive lock on the vector file and the row is
+    taken from its size, so several processes can share a directory; keys
+    appended by another process are indexed on this process' next miss.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Args:
+            directory (str): Directory holding the store for a single model
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.vectors_path = os.path.join(directory, "vectors.f32")
+        self.keys_path = os.path.join(directory, "keys.txt")
+        self.meta_path = os.path.join(directory, "meta.json")
+        self.dim: Optional[int] = None
+        self.index: Dict[str, int] = {}
+        self._rows = 0
+        # Bytes of keys.txt already indexed; later lines come from appends.
+        self._keys_offset = 0
+        self._mmap: Optional[np.memmap] = None
+        self._lock = threading.Lock()
+        self._load()
+
+    @staticmethod
+    def _lock_file(f, exclusive: bool = True):
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_UN)
+
+    def _load_meta(self):
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                self.dim = json.load(f)["dim"]
+
+    def _load(self):
+        self._load_meta()
+        if self.dim is None or not os.path.exists(self.vectors_path):
+            return
+        row_bytes = self.dim * 4
+        with open(self.vectors_path, "r+b") as vectors:
+            self._lock_file(vectors)
+            try:
+                rows = os.fstat(vectors.fileno()).st_size // row_bytes
+                if os.path.exists(self.keys_path):
+                    self._read_keys(rows)
+                # Vector bytes without a key come from an interrupted write.
+                vectors.truncate(self._rows * row_bytes)
+            finally:
+                self._lock_file(vectors, exclusive=False)
+
+    def _read_keys(self, rows: int):
+        with open(self.keys_path, "r+", encoding="utf-8") as f:
+            complete = 0
+            for line in iter(f.readline, ""):
+                # A line without newline was cut short by a crash; drop it
+                # so the next append starts on a fresh line.
+                if not line.endswith("\n"):
+                    f.truncate(complete)
+                    break
+                complete = f.tell()
+                key, _, row = line.rstrip("\n").partition("\t")
+                if not row.isdigit() or int(row) >= rows:
+                    continue
+                self.index[key] = int(row)
+                self._rows = max(self._rows, int(row) + 1)
+            self._keys_offset = complete
+
+    def _refresh(self) -> bool:
+        """Index keys appended by other processes since the last read.
+
+        Returns:
+            bool: True if new keys were read
+        """
+        try:
+            size = os.path.getsize(self.keys_path)
+        except OSError:
+            return False
+        if size <= self._keys_offset:
+            return False
+        if self.dim is None:
+            self._load_meta()
+        with open(self.keys_path, "rb") as f:
+            f.seek(self._keys_offset)
+            data = f.read(size - self._keys_offset)
+        # A writer may be mid-line; leave it for the next refresh. Vectors
+        # are flushed before their key line, so every complete line's row
+        # is on disk.
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].decode("utf-8").splitlines():
+            key, _, row = line.partition("\t")
+            if row.isdigit():
+                self.index.setdefault(key, int(row))
+                self._rows = max(self._rows, int(row) + 1)
+        self._keys_offset += end
+        return end > 0
+
+    def _vectors(self) -> np.memmap:
+        if self._mmap is None or self._mmap.shape[0] < self._rows:
+            self._mmap = np.memmap(
+                self.vectors_path,
+                dtype=np.float32,
+                mode="r",
+                shape=(self._rows, self.dim),
+            )
+        return self._mmap
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            row = self.index.get(key)
+            if row is None and self._refresh():
+                row = self.index.get(key)
+            if row is None:
+                return None
+            return np.array(self._vectors()[row])
+
+    def put(self, key: str, vector: np.ndarray):
+        vector = np.asarray(vector, dtype=np.float32).reshape(-1)
+        with self._lock:
+            if key in self.index:
+                return
+            if self.dim is None:
+                self.dim = int(vector.shape[0])
+                with open(self.meta_path, "w", encoding="utf-8") as f:
+                    json.dump({"dim": self.dim}, f)
+            if vector.shape[0] != self.dim:
+                logging.warning(
+                    f"⚠️ Skipping cache write: dim {vector.shape[0]} != {self.dim}"
+                )
+                return
+            row_bytes = self.dim * 4
+            with open(self.vectors_path, "ab") as vectors:
+                self._lock_file(vectors)
+                try:
+                    # The file may have grown in another process; a partial
+                    # row left by a crashed writer is overwritten.
+                    size = os.fstat(vectors.fileno()).st_size
+                    row = size // row_bytes
+                    if size % row_bytes:
+                        vectors.truncate(row * row_bytes)
+                    vectors.write(vector.tobytes())
+                    vectors.flush()
+                    with open(self.keys_path, "a", encoding="utf-8") as keys:
+                        keys.write(f"{key}\t{row}\n")
+                finally:
+                    self._lock_file(vectors, exclusive=False)
+            self.index[key] = row
+            self._rows = max(self._rows, row + 1)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+
+class EmbeddingCache:
+    """Content-hashed LRU embedding cache with optional on-disk backing.
+
+    Cached vectors are shared between callers, so they are stored and
+    returned as read-only arrays; copy one before modifying it in place.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        max_entries: int = 10000,
+        cache_dir: Optional[str] = None,
+    ):
+        """
+        Args:
+            model_name (str): Model whose embeddings are cached
+            max_entries (int): Maximum vectors kept in memory
+            cache_dir (Optional[str]): Root directory of the persistent store;
+                a sub-directory per model name is used. Memory only if None.
+        """
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.disk_store = None
+        if cache_dir:
+            safe_name = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+            self.disk_store = DiskEmbeddingStore(os.path.join(cache_dir, safe_name))
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        key = text_hash(text)
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return vector
+        if self.disk_store is not None:
+            vector = self.disk_store.get(key)
+            if vector is not None:
+                with self._lock:
+                    self.disk_hits += 1
+                    self._remember(key, vector)
+                return vector
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def get_many(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        return [self.get(text) for text in texts]
+
+    def put(self, text: str, vector: np.ndarray) -> np.ndarray:
+        """Cache a vector and return the read-only copy that was stored."""
+        key = text_hash(text)
+        vector = np.array(vector, dtype=np.float32)
+        vector.flags.writeable = False
+        with self._lock:
+            self._remember(key, vector)
+        if self.disk_store is not None:
+            self.disk_store.put(key, vector)
+        return vector
+
+    def _remember(self, key: str, vector: np.ndarray):
+        vector.flags.writeable = False
+        self._entries[key] = vector
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current sizes."""
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "memory_entries": len(self._entries),
+            "disk_entries": len(self.disk_store) if self.disk_store else 0,
+        }
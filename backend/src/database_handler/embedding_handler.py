@@ -1,50 +1,270 @@
+import asyncio
 import logging
-from typing import List
+from typing import Dict, List, Optional
 
 import numpy as np
-from sentence_transformers import SentenceTransformer
+
+from .embedding_backends import create_embedding_backend
+from .embedding_batcher import EmbeddingBatcher
+from .embedding_cache import EmbeddingCache
+
+# Task instructions expected by asymmetric retrieval models.
+MODEL_TASK_PREFIXES: Dict[str, Dict[str, str]] = {
+    "nomic-ai/nomic-embed-text-v1": {
+        "query": "search_query: ",
+        "document": "search_document: ",
+    },
+    "nomic-ai/nomic-embed-text-v1.5": {
+        "query": "search_query: ",
+        "document": "search_document: ",
+    },
+}
+
+
+def quantize_embeddings(embeddings: np.ndarray, dtype: str = "float32") -> np.ndarray:
+    """Convert a float32 embedding matrix to a compact storage type.
+
+    ``int8`` uses a symmetric scale of 127 and assumes normalised vectors.
+
+    Args:
+        embeddings (np.ndarray): float32 embeddings
+        dtype (str): One of ``float32``, ``float16`` or ``int8``
+
+    Returns:
+        np.ndarray: Embeddings in the requested type
+    """
+    if dtype == "float32":
+        return embeddings.astype(np.float32, copy=False)
+    if dtype == "float16":
+        return embeddings.astype(np.float16)
+    if dtype == "int8":
+        return np.clip(np.rint(embeddings * 127), -127, 127).astype(np.int8)
+    raise ValueError(f"Unsupported embedding dtype: {dtype}")
+
+
+def truncate_embeddings(
+    embeddings: np.ndarray, output_dim: int, normalize: bool = True
+) -> np.ndarray:
+    """Matryoshka-truncate raw embeddings to ``output_dim`` dimensions.
+
+    Follows the nomic-embed-text-v1.5 recipe: layer-norm over the full
+    vector, keep the leading ``output_dim`` components, then L2-normalise.
+
+    Args:
+        embeddings (np.ndarray): Unnormalised ``(n, dim)`` embeddings
+        output_dim (int): Number of leading dimensions to keep
+        normalize (bool): L2-normalise the truncated vectors
+
+    Returns:
+        np.ndarray: ``(n, output_dim)`` float32 embeddings
+    """
+    mean = embeddings.mean(axis=1, keepdims=True)
+    var = embeddings.var(axis=1, keepdims=True)
+    embeddings = (embeddings - mean) / np.sqrt(var + 1e-5)
+    embeddings = embeddings[:, :output_dim]
+    if normalize:
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        embeddings = embeddings / np.maximum(norms, 1e-12)
+    return np.ascontiguousarray(embeddings, dtype=np.float32)
 
 
 class EmbeddingHandler:
-    def __init__(self, model_name: str = "nomic-ai/nomic-embed-text-v1.5"):
+    def __init__(
+        self,
+        model_name: str = "nomic-ai/nomic-embed-text-v1.5",
+        cache_size: int = 10000,
+        cache_dir: Optional[str] = None,
+        micro_batching: bool = False,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        normalize: bool = True,
+        batch_size: int = 32,
+        backend: str = "torch",
+        output_dim: Optional[int] = None,
+    ):
         """Initialize the embedding handler with a specific model.
 
+        The model is loaded lazily from the shared model registry on first use.
+
         Args:
             model_name (str): Name of the sentence transformer model to use
+            cache_size (int): Embeddings kept in the in-memory LRU cache;
+                0 disables caching
+            cache_dir (Optional[str]): Directory for the persistent
+                memory-mapped embedding cache
+            micro_batching (bool): Coalesce concurrent get_embedding calls
+                into shared model.encode batches
+            max_batch_size (int): Maximum texts per micro-batch
+            max_wait_ms (float): Time a micro-batch waits for more requests
+            normalize (bool): L2-normalise vectors so cosine is a dot product
+            batch_size (int): Batch size passed to model.encode
+            backend (str): Inference backend, see create_embedding_backend
+            output_dim (Optional[int]): Matryoshka truncation dimension
+                (e.g. 256 or 512 for nomic-embed-text-v1.5); full size if None
         """
-        self.model = SentenceTransformer(
-            model_name, trust_remote_code=True, cache_folder="./models"
+        self.model_name = model_name
+        self.normalize = normalize
+        self.batch_size = batch_size
+        self.output_dim = output_dim
+        self.backend = create_embedding_backend(backend, model_name)
+        # Backends differ slightly numerically and truncated vectors are not
+        # interchangeable, so each combination gets its own cache.
+        cache_name = model_name if backend == "torch" else f"{model_name}-{backend}"
+        if output_dim:
+            cache_name = f"{cache_name}-{output_dim}d"
+        # Identifies the vector space; used by the cache and ingestion manifest.
+        self.model_version = cache_name
+        self.cache = (
+            EmbeddingCache(cache_name, max_entries=cache_size, cache_dir=cache_dir)
+            if cache_size > 0
+            else None
         )
+        self.batcher = (
+            EmbeddingBatcher(
+                self._encode,
+                max_batch_size=max_batch_size,
+                max_wait_ms=max_wait_ms,
+            )
+            if micro_batching
+            else None
+        )
+
+    @property
+    def model(self):
+        return self.backend.model
+
+    def load_model(self) -> None:
+        """Load the embedding model now instead of on the first request."""
+        self.model
 
-    def get_embedding(self, text: str) -> List[float]:
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """Encode texts into a float32 ``(n, dim)`` matrix."""
+        if not self.output_dim:
+            return self.backend.encode(
+                texts, batch_size=self.batch_size, normalize=self.normalize
+            )
+        embeddings = self.backend.encode(
+            texts, batch_size=self.batch_size, normalize=False
+        )
+        return truncate_embeddings(embeddings, self.output_dim, self.normalize)
+
+    def get_embedding(self, text: str) -> np.ndarray:
         """Get embedding for a single text.
 
         Args:
             text (str): Text to embed
 
         Returns:
-            List[float]: Embedding vector
+            np.ndarray: float32 embedding vector
+        """
+        try:
+            if self.cache is not None:
+                cached = self.cache.get(text)
+                if cached is not None:
+                    return cached
+            if self.batcher is not None:
+                embedding = self.batcher.embed(text)
+            else:
+                embedding = self._encode([text])[0]
+            if self.cache is not None:
+                embedding = self.cache.put(text, embedding)
+            return embedding
+        except Exception as e:
+            logging.error(f"❌ Error generating embedding: {e}")
+            raise
+
+    async def aget_embedding(self, text: str) -> np.ndarray:
+        """Get embedding for a single text without blocking the event loop.
+
+        Args:
+            text (str): Text to embed
+
+        Returns:
+            np.ndarray: float32 embedding vector
         """
+        if self.batcher is None:
+            return await asyncio.to_thread(self.get_embedding, text)
         try:
-            return self.model.encode(text).tolist()
+            if self.cache is not None:
+                cached = self.cache.get(text)
+                if cached is not None:
+                    return cached
+            embedding = await self.batcher.aembed(text)
+            if self.cache is not None:
+                embedding = self.cache.put(text, embedding)
+            return embedding
         except Exception as e:
             logging.error(f"❌ Error generating embedding: {e}")
             raise
 
-    def get_batch_embeddings(self, texts: List[str]) -> List[List[float]]:
+    def get_batch_embeddings(
+        self, texts: List[str], dtype: str = "float32"
+    ) -> np.ndarray:
         """Get embeddings for multiple texts in batch.
 
         Args:
             texts (List[str]): List of texts to embed
+            dtype (str): Output type, one of ``float32``, ``float16`` or ``int8``
 
         Returns:
-            List[List[float]]: List of embedding vectors
+            np.ndarray: ``(len(texts), dim)`` embedding matrix
         """
         try:
-            embeddings = self.model.encode(texts)
-            if isinstance(embeddings, np.ndarray):
-                return embeddings.tolist()
-            return embeddings
+            if not texts:
+                return np.empty((0, 0), dtype=np.float32)
+            if self.cache is None:
+                return quantize_embeddings(self._encode(texts), dtype)
+
+            # Only the cache misses are sent to the model, in a single batch.
+            results = self.cache.get_many(texts)
+            missing = [i for i, vector in enumerate(results) if vector is None]
+            if missing:
+                embeddings = self._encode([texts[i] for i in missing])
+                for i, embedding in zip(missing, embeddings):
+                    self.cache.put(texts[i], embedding)
+                    results[i] = embedding
+            return quantize_embeddings(np.stack(results), dtype)
         except Exception as e:
             logging.error(f"❌ Batch embedding error: {e}")
             raise
+
+    def _with_prefix(self, texts: List[str], task: str) -> List[str]:
+        prefix = MODEL_TASK_PREFIXES.get(self.model_name, {}).get(task, "")
+        return [f"{prefix}{text}" for text in texts] if prefix else list(texts)
+
+    def embed_query(self, query: str) -> np.ndarray:
+        """Embed a single search query with the model's query instruction.
+
+        Args:
+            query (str): Search query
+
+        Returns:
+            np.ndarray: float32 embedding vector
+        """
+        return self.get_embedding(self._with_prefix([query], "query")[0])
+
+    def embed_queries(self, queries: List[str]) -> np.ndarray:
+        """Embed search queries with the model's query instruction.
+
+        Args:
+            queries (List[str]): Search queries
+
+        Returns:
+            np.ndarray: ``(len(queries), dim)`` embedding matrix
+        """
+        return self.get_batch_embeddings(self._with_prefix(queries, "query"))
+
+    def embed_documents(self, documents: List[str]) -> np.ndarray:
+        """Embed passages to be indexed with the model's document instruction.
+
+        Args:
+            documents (List[str]): Passages to embed
+
+        Returns:
+            np.ndarray: ``(len(documents), dim)`` embedding matrix
+        """
+        return self.get_batch_embeddings(self._with_prefix(documents, "document"))
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Hit/miss counters of the embedding cache."""
+        return self.cache.stats() if self.cache is not None else {}
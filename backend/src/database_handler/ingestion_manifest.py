@@ -0,0 +1,104 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+
+def hash_file(file_path: str) -> str:
+    """SHA-256 of a file's bytes, read in blocks."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def hash_text(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class IngestionManifest:
+    """Record of what has been ingested, used to skip unchanged work.
+
+    Stored as JSON::
+
+        {
+            "collection": "...",
+            "embedding_model": "...",
+            "files": {
+                "<filename>": {
+                    "content_hash": "...",
+                    "file_path": "<S3 URL>",
+                    "chunks": [{"hash": "...", "id": <point id>}, ...]
+                }
+            }
+        }
+
+    A manifest written for another collection or embedding model version
+    is discarded, which forces a full re-index.
+    """
+
+    def __init__(self, path: str, collection: str, embedding_model: str):
+        """
+        Args:
+            path (str): JSON file backing the manifest
+            collection (str): Qdrant collection the manifest describes
+            embedding_model (str): Embedding model version the vectors came from
+        """
+        self.path = path
+        self.collection = collection
+        self.embedding_model = embedding_model
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            logging.warning(f"⚠️ Ignoring unreadable manifest {self.path}: {e}")
+            return
+        if (
+            data.get("collection") != self.collection
+            or data.get("embedding_model") != self.embedding_model
+        ):
+            logging.info(
+                "ℹ️ Manifest was built for another collection or embedding model; "
+                "re-indexing everything"
+            )
+            return
+        self.files = data.get("files", {})
+
+    def get(self, filename: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self.files.get(filename)
+
+    def set(self, filename: str, entry: Dict[str, Any]):
+        with self._lock:
+            self.files[filename] = entry
+
+    def remove(self, filename: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self.files.pop(filename, None)
+
+    def filenames(self) -> List[str]:
+        with self._lock:
+            return list(self.files)
+
+    def save(self):
+        """Atomically write the manifest next to its final path."""
+        with self._lock:
+            data = {
+                "collection": self.collection,
+                "embedding_model": self.embedding_model,
+                "files": self.files,
+            }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, self.path)
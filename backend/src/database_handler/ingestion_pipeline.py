@@ -0,0 +1,328 @@
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .ingestion_manifest import IngestionManifest, hash_file, hash_text
+
+_DONE = object()
+
+
+class IngestionPipeline:
+    """Streaming markdown ingestion: read → chunk → embed → upsert.
+
+    Each stage runs on its own worker threads and hands items to the next
+    stage through a bounded queue, so I/O-bound reads/uploads overlap with
+    CPU-bound chunking/embedding and peak memory depends on the queue sizes,
+    not on the corpus size. An optional IngestionManifest makes re-runs
+    incremental.
+    """
+
+    def __init__(
+        self,
+        qdrant_client,
+        embed_batch_size: int = 64,
+        upsert_batch_size: int = 256,
+        reader_workers: int = 4,
+        chunk_workers: int = 2,
+        upload_workers: int = 2,
+        queue_size: int = 8,
+    ):
+        """
+        Args:
+            qdrant_client (QdrantDBClient): Client providing parsing, chunking,
+                embedding and upserts
+            embed_batch_size (int): Chunks per embedding call
+            upsert_batch_size (int): Points per upsert request
+            reader_workers (int): Threads reading files / uploading PDFs
+            chunk_workers (int): Threads chunking file contents
+            upload_workers (int): Threads uploading batches to Qdrant
+            queue_size (int): Capacity of each inter-stage queue, in items
+        """
+        self.qdrant_client = qdrant_client
+        self.embed_batch_size = embed_batch_size
+        self.upsert_batch_size = upsert_batch_size
+        self.reader_workers = reader_workers
+        self.chunk_workers = chunk_workers
+        self.upload_workers = upload_workers
+        self.queue_size = queue_size
+        self._stats_lock = threading.Lock()
+
+    def _count(self, stats: Dict[str, Any], key: str, value: float = 1):
+        with self._stats_lock:
+            stats[key] += value
+
+    def _start_stage(
+        self,
+        name: str,
+        worker: Callable[[Any], Iterable[Any]],
+        in_queue: queue.Queue,
+        out_queue: Optional[queue.Queue],
+        workers: int,
+        stats: Dict[str, Any],
+    ) -> List[threading.Thread]:
+        """Run ``worker`` on ``workers`` threads between two queues.
+
+        Every output of ``worker`` is put on ``out_queue``. When the input is
+        exhausted the last thread to finish forwards the end marker.
+        """
+        remaining = [workers]
+        lock = threading.Lock()
+
+        def _loop():
+            while True:
+                item = in_queue.get()
+                if item is _DONE:
+                    # Let sibling workers see the end marker too.
+                    in_queue.put(_DONE)
+                    break
+                try:
+                    for output in worker(item):
+                        if out_queue is not None:
+                            out_queue.put(output)
+                except Exception as e:
+                    logging.error(f"❌ Ingestion {name} stage error: {e}")
+                    self._count(stats, "errors")
+            with lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last and out_queue is not None:
+                out_queue.put(_DONE)
+
+        threads = [
+            threading.Thread(target=_loop, name=f"ingest-{name}-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in threads:
+            thread.start()
+        return threads
+
+    def run(
+        self,
+        directory_path: str,
+        collection_name: Optional[str] = None,
+        chunk_size: int = 1024,
+        chunk_overlap: int = 100,
+        manifest: Optional[IngestionManifest] = None,
+    ) -> Dict[str, Any]:
+        """Ingest every markdown file of a directory.
+
+        With a manifest, files whose content hash is unchanged are skipped
+        entirely, only chunks whose hash changed are re-embedded, and points
+        of removed chunks or files are deleted. The manifest is saved at the
+        end, leaving out files whose upserts failed so they are retried.
+
+        Args:
+            directory_path (str): Directory containing markdown files
+            collection_name (Optional[str]): Target collection name
+            chunk_size (int): Maximum size of each text chunk
+            chunk_overlap (int): Overlap between consecutive chunks
+            manifest (Optional[IngestionManifest]): Previous ingestion state
+
+        Returns:
+            Dict[str, Any]: Ingestion metrics (counts, timings, throughput)
+        """
+        client = self.qdrant_client
+        stats: Dict[str, Any] = {
+            "files": 0,
+            "skipped_files": 0,
+            "removed_files": 0,
+            "points": 0,
+            "skipped_chunks": 0,
+            "deleted_points": 0,
+            "inserted": 0,
+            "failed": 0,
+            "errors": 0,
+            "embed_seconds": 0.0,
+            "upsert_seconds": 0.0,
+        }
+        start = time.perf_counter()
+        manifest_updates: Dict[str, Dict[str, Any]] = {}
+        failed_files = set()
+
+        file_queue: queue.Queue = queue.Queue()
+        content_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        chunk_queue: queue.Queue = queue.Queue(
+            maxsize=self.queue_size * self.embed_batch_size
+        )
+        upload_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+
+        def read(filename: str):
+            content_hash = None
+            if manifest is not None and filename.endswith(".md"):
+                content_hash = hash_file(os.path.join(directory_path, filename))
+                entry = manifest.get(filename)
+                if entry and entry["content_hash"] == content_hash:
+                    self._count(stats, "skipped_files")
+                    return
+            document = client.read_markdown_document(directory_path, filename)
+            if document is not None:
+                document["content_hash"] = content_hash
+                self._count(stats, "files")
+                yield document
+
+        def chunk(document: Dict[str, Any]):
+            points = client.chunk_markdown_document(
+                document,
+                chunk_size=chunk_size,
+                chunk_overlap=chunk_overlap,
+                source_type="markdown",
+            )
+            if manifest is None:
+                yield from points
+                return
+
+            filename = document["filename"]
+            previous = manifest.get(filename) or {}
+            previous_chunks = previous.get("chunks", [])
+            chunks = []
+            for i, point in enumerate(points):
+                chunk_hash = hash_text(point["payload"]["text"])
+                chunks.append({"hash": chunk_hash, "id": point["id"]})
+                if i < len(previous_chunks) and previous_chunks[i] == chunks[-1]:
+                    self._count(stats, "skipped_chunks")
+                    continue
+                yield point
+
+            stale_ids = {c["id"] for c in previous_chunks} - {c["id"] for c in chunks}
+            if stale_ids and client.delete_vectors(list(stale_ids), collection_name):
+                self._count(stats, "deleted_points", len(stale_ids))
+            with self._stats_lock:
+                manifest_updates[filename] = {
+                    "content_hash": document["content_hash"],
+                    "file_path": document["file_path"],
+                    "chunks": chunks,
+                }
+
+        def upload(batch: List[Dict[str, Any]]):
+            upsert_start = time.perf_counter()
+            # The stage threads are the parallel uploaders; one batch per call
+            # keeps failures attributable to files for the manifest.
+            ok = client.upload_points(
+                batch, collection_name, batch_size=self.upsert_batch_size
+            )
+            self._count(stats, "upsert_seconds", time.perf_counter() - upsert_start)
+            self._count(stats, "inserted" if ok else "failed", len(batch))
+            if not ok:
+                with self._stats_lock:
+                    failed_files.update(p["payload"]["filename"] for p in batch)
+            return ()
+
+        threads = []
+        threads += self._start_stage(
+            "read", read, file_queue, content_queue, self.reader_workers, stats
+        )
+        threads += self._start_stage(
+            "chunk", chunk, content_queue, chunk_queue, self.chunk_workers, stats
+        )
+        threads += self._start_stage(
+            "upload", upload, upload_queue, None, self.upload_workers, stats
+        )
+        # A single embedder keeps the model busy with full batches.
+        embedder = threading.Thread(
+            target=self._embed_loop,
+            args=(chunk_queue, upload_queue, stats, failed_files),
+            name="ingest-embed",
+            daemon=True,
+        )
+        embedder.start()
+        threads.append(embedder)
+
+        filenames = sorted(os.listdir(directory_path))
+        for filename in filenames:
+            file_queue.put(filename)
+        file_queue.put(_DONE)
+
+        for thread in threads:
+            thread.join()
+
+        if manifest is not None:
+            self._update_manifest(
+                manifest,
+                filenames,
+                manifest_updates,
+                failed_files,
+                collection_name,
+                stats,
+            )
+
+        stats["seconds"] = time.perf_counter() - start
+        stats["chunks_per_second"] = (
+            stats["inserted"] / stats["seconds"] if stats["seconds"] else 0.0
+        )
+        return stats
+
+    def _update_manifest(
+        self,
+        manifest: IngestionManifest,
+        filenames: List[str],
+        manifest_updates: Dict[str, Dict[str, Any]],
+        failed_files: set,
+        collection_name: Optional[str],
+        stats: Dict[str, Any],
+    ):
+        for filename, entry in manifest_updates.items():
+            if filename in failed_files:
+                # Keep the old entry so the file is re-ingested next run.
+                continue
+            manifest.set(filename, entry)
+
+        present = set(filenames)
+        for filename in manifest.filenames():
+            if filename in present:
+                continue
+            entry = manifest.get(filename) or {}
+            point_ids = [c["id"] for c in entry.get("chunks", [])]
+            if point_ids and not self.qdrant_client.delete_vectors(
+                point_ids, collection_name
+            ):
+                continue
+            manifest.remove(filename)
+            stats["removed_files"] += 1
+            stats["deleted_points"] += len(point_ids)
+        manifest.save()
+
+    def _embed_loop(
+        self,
+        chunk_queue: queue.Queue,
+        upload_queue: queue.Queue,
+        stats: Dict[str, Any],
+        failed_files: set,
+    ):
+        batch: List[Dict[str, Any]] = []
+        pending: List[Dict[str, Any]] = []
+
+        def _embed():
+            embed_start = time.perf_counter()
+            try:
+                pending.extend(self.qdrant_client.embed_points(batch))
+            except Exception as e:
+                logging.error(f"❌ Ingestion embed stage error: {e}")
+                self._count(stats, "errors")
+                self._count(stats, "failed", len(batch))
+                # Keep these files out of the manifest so they are retried.
+                with self._stats_lock:
+                    failed_files.update(p["payload"]["filename"] for p in batch)
+            else:
+                self._count(stats, "points", len(batch))
+                logging.info(f"📦 Embedded {stats['points']} chunks")
+            self._count(stats, "embed_seconds", time.perf_counter() - embed_start)
+            batch.clear()
+
+        while True:
+            point = chunk_queue.get()
+            if point is _DONE:
+                break
+            batch.append(point)
+            if len(batch) >= self.embed_batch_size:
+                _embed()
+            while len(pending) >= self.upsert_batch_size:
+                upload_queue.put(pending[: self.upsert_batch_size])
+                del pending[: self.upsert_batch_size]
+        if batch:
+            _embed()
+        for offset in range(0, len(pending), self.upsert_batch_size):
+            upload_queue.put(pending[offset : offset + self.upsert_batch_size])
+        upload_queue.put(_DONE)
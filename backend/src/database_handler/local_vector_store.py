@@ -0,0 +1,693 @@
+import json
+import logging
+import operator
+import os
+import shutil
+import threading
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import numpy as np
+
+PointId = Union[int, str]
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+_RANGE_OPS = {
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "lt": operator.lt,
+    "lte": operator.le,
+}
+
+
+def _condition_matches(value: Any, condition: Any) -> bool:
+    if isinstance(condition, dict):
+        return value is not None and all(
+            _RANGE_OPS[op](value, bound) for op, bound in condition.items()
+        )
+    if isinstance(condition, (list, tuple, set)):
+        return value in condition
+    return value == condition
+
+
+def payload_matches(
+    payload: Optional[Dict[str, Any]],
+    must: Optional[Dict[str, Any]] = None,
+    should: Optional[Dict[str, Any]] = None,
+    must_not: Optional[Dict[str, Any]] = None,
+) -> bool:
+    """Evaluate a ``build_payload_filter``-style filter against one payload."""
+    payload = payload or {}
+    if must and not all(_condition_matches(payload.get(k), c) for k, c in must.items()):
+        return False
+    if should and not any(
+        _condition_matches(payload.get(k), c) for k, c in should.items()
+    ):
+        return False
+    if must_not and any(
+        _condition_matches(payload.get(k), c) for k, c in must_not.items()
+    ):
+        return False
+    return True
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the ``k`` largest scores, best first."""
+    if k >= scores.shape[0]:
+        return np.argsort(-scores)
+    top = np.argpartition(-scores, k)[:k]
+    return top[np.argsort(-scores[top])]
+
+
+class _LocalCollection:
+    """One collection stored in its own directory.
+
+    ``vectors.f32`` holds L2-normalised float32 rows and is read through a
+    memory map; ``points.jsonl`` is an append-only log of upserts and
+    deletes replayed on load. Re-upserting an ID appends a new row and
+    retires the old one; ``compact`` drops retired rows.
+    """
+
+    def __init__(self, name: str, directory: str, vector_size: int):
+        self.name = name
+        self.directory = directory
+        self.vectors_path = os.path.join(directory, "vectors.f32")
+        self.log_path = os.path.join(directory, "points.jsonl")
+        self.meta_path = os.path.join(directory, "meta.json")
+        self.index_path = os.path.join(directory, "ivf.npz")
+        self.vector_size = vector_size
+        self.ids: List[Optional[PointId]] = []
+        self.payloads: List[Optional[Dict[str, Any]]] = []
+        self.row_of: Dict[PointId, int] = {}
+        self.alive = np.zeros(0, dtype=bool)
+        self._mmap: Optional[np.memmap] = None
+        self.lock = threading.RLock()
+        # IVF index: centroids, per-row list assignment and how many rows
+        # it covers. Rows appended later are scanned exactly.
+        self.centroids: Optional[np.ndarray] = None
+        self.assignments: Optional[np.ndarray] = None
+        self.indexed_rows = 0
+        self.nprobe = 8
+        self._list_order: Optional[np.ndarray] = None
+        self._list_bounds: Optional[np.ndarray] = None
+
+    @classmethod
+    def create(cls, name: str, directory: str, vector_size: int):
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({"vector_size": vector_size, "distance": "Cosine"}, f)
+        open(os.path.join(directory, "vectors.f32"), "wb").close()
+        open(os.path.join(directory, "points.jsonl"), "w").close()
+        return cls(name, directory, vector_size)
+
+    @classmethod
+    def load(cls, name: str, directory: str):
+        with open(os.path.join(directory, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        collection = cls(name, directory, meta["vector_size"])
+        collection._replay()
+        collection._load_index()
+        return collection
+
+    def _replay(self):
+        row_bytes = self.vector_size * 4
+        rows = os.path.getsize(self.vectors_path) // row_bytes
+        log_bytes = 0
+        with open(self.log_path, "rb") as f:
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("unterminated line")
+                    record = json.loads(line)
+                except ValueError:
+                    logging.warning(f"⚠️ Ignoring truncated log entry in '{self.name}'")
+                    break
+                if "delete" in record:
+                    for point_id in record["delete"]:
+                        self._retire(point_id)
+                    log_bytes += len(line)
+                    continue
+                # Ignore log entries whose vector row was never fully written.
+                if record["row"] >= rows:
+                    break
+                self._pad_to(record["row"])
+                self._retire(record["id"])
+                self.ids.append(record["id"])
+                self.payloads.append(record["payload"])
+                self.row_of[record["id"]] = record["row"]
+                log_bytes += len(line)
+        # Cut what an interrupted upsert left behind: the unreadable log
+        # tail and vector rows the log never recorded. Appends then start
+        # at the row the log expects.
+        with open(self.log_path, "r+b") as f:
+            f.truncate(log_bytes)
+        with open(self.vectors_path, "r+b") as f:
+            f.truncate(len(self.ids) * row_bytes)
+        self.alive = np.ones(len(self.ids), dtype=bool)
+        for row, point_id in enumerate(self.ids):
+            if point_id is None or self.row_of.get(point_id) != row:
+                self.alive[row] = False
+
+    def _pad_to(self, row: int):
+        """Fill rows up to ``row`` with dead placeholders."""
+        missing = row - len(self.ids)
+        if missing <= 0:
+            return
+        self.ids.extend([None] * missing)
+        self.payloads.extend([None] * missing)
+        if self.alive.shape[0] < len(self.ids):
+            self.alive = np.concatenate(
+                [self.alive, np.zeros(len(self.ids) - self.alive.shape[0], bool)]
+            )
+
+    def _retire(self, point_id: PointId):
+        row = self.row_of.pop(point_id, None)
+        if row is not None and row < self.alive.shape[0]:
+            self.alive[row] = False
+        if row is not None and row < len(self.payloads):
+            self.payloads[row] = None
+
+    def _load_index(self):
+        if not os.path.exists(self.index_path):
+            return
+        data = np.load(self.index_path)
+        self.centroids = data["centroids"]
+        self.assignments = data["assignments"]
+        self.indexed_rows = int(self.assignments.shape[0])
+        self.nprobe = int(data["nprobe"])
+        self._build_lists()
+
+    def _build_lists(self):
+        # Rows grouped by cluster: rows of list c are
+        # _list_order[_list_bounds[c]:_list_bounds[c + 1]].
+        self._list_order = np.argsort(self.assignments, kind="stable")
+        self._list_bounds = np.searchsorted(
+            self.assignments[self._list_order],
+            np.arange(self.centroids.shape[0] + 1),
+        )
+
+    def vectors(self) -> np.ndarray:
+        rows = len(self.ids)
+        if rows == 0:
+            return np.zeros((0, self.vector_size), dtype=np.float32)
+        if self._mmap is None or self._mmap.shape[0] != rows:
+            self._mmap = np.memmap(
+                self.vectors_path,
+                dtype=np.float32,
+                mode="r",
+                shape=(rows, self.vector_size),
+            )
+        return self._mmap
+
+    @property
+    def points_count(self) -> int:
+        return len(self.row_of)
+
+    def upsert(self, ids: List[PointId], vectors: np.ndarray, payloads: List[Dict]):
+        vectors = _normalize(np.asarray(vectors, dtype=np.float32))
+        row_bytes = self.vector_size * 4
+        with self.lock:
+            with open(self.vectors_path, "ab") as f:
+                # Take the row from the file, which may hold rows of an
+                # earlier upsert that failed before logging them.
+                size = os.fstat(f.fileno()).st_size
+                start = size // row_bytes
+                if size % row_bytes:
+                    f.truncate(start * row_bytes)
+                f.write(vectors.tobytes())
+            self._pad_to(start)
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                for offset, (point_id, payload) in enumerate(zip(ids, payloads)):
+                    f.write(
+                        json.dumps(
+                            {"row": start + offset, "id": point_id, "payload": payload}
+                        )
+                        + "\n"
+                    )
+            self.alive = np.concatenate([self.alive, np.ones(len(ids), dtype=bool)])
+            for offset, (point_id, payload) in enumerate(zip(ids, payloads)):
+                self._retire(point_id)
+                self.ids.append(point_id)
+                self.payloads.append(payload)
+                self.row_of[point_id] = start + offset
+
+    def delete(self, ids: List[PointId]):
+        with self.lock:
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"delete": list(ids)}) + "\n")
+            for point_id in ids:
+                self._retire(point_id)
+
+    def _candidate_rows(self, queries: np.ndarray) -> Optional[List[np.ndarray]]:
+        """Rows to score per query using the IVF index, or None for exact search."""
+        if self.centroids is None:
+            return None
+        nprobe = min(self.nprobe, self.centroids.shape[0])
+        tail = np.arange(self.indexed_rows, len(self.ids))
+        probes = np.argsort(-(queries @ self.centroids.T), axis=1)[:, :nprobe]
+        bounds, order = self._list_bounds, self._list_order
+        candidates = []
+        for probe in probes:
+            rows = np.concatenate([order[bounds[c] : bounds[c + 1]] for c in probe])
+            # Sorted rows keep memory-map reads sequential.
+            candidates.append(np.concatenate([np.sort(rows), tail]))
+        return candidates
+
+    def search(
+        self,
+        queries: np.ndarray,
+        limit: int,
+        score_threshold: Optional[float] = None,
+        payload_filter: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        exact: bool = False,
+    ) -> List[List[Dict[str, Any]]]:
+        queries = np.asarray(queries, dtype=np.float32).reshape(-1, self.vector_size)
+        queries = _normalize(queries)
+        with self.lock:
+            vectors = self.vectors()
+            alive = self.alive
+            if payload_filter is not None:
+                # Filter before ranking so ``limit`` matching points come back.
+                alive = alive & np.fromiter(
+                    (
+                        payload is not None and payload_filter(payload)
+                        for payload in self.payloads
+                    ),
+                    dtype=bool,
+                    count=len(self.payloads),
+                )
+            candidates = None if exact else self._candidate_rows(queries)
+            if candidates is None:
+                # One matmul scores every query against every row.
+                all_scores = queries @ vectors.T if len(vectors) else None
+
+            results = []
+            for i, query in enumerate(queries):
+                if candidates is None:
+                    rows = np.arange(len(vectors))
+                    scores = (
+                        all_scores[i].copy() if all_scores is not None else np.zeros(0)
+                    )
+                else:
+                    rows = candidates[i]
+                    scores = vectors[rows] @ query if len(rows) else np.zeros(0)
+                live = alive[rows]
+                rows, scores = rows[live], scores[live]
+                if score_threshold is not None:
+                    keep = scores >= score_threshold
+                    rows, scores = rows[keep], scores[keep]
+                results.append(
+                    [
+                        {
+                            "id": self.ids[rows[j]],
+                            "score": float(scores[j]),
+                            "payload": self.payloads[rows[j]],
+                        }
+                        for j in _top_k(scores, limit)
+                    ]
+                )
+            return results
+
+    def build_ivf_index(
+        self, n_lists: Optional[int] = None, nprobe: int = 8, iterations: int = 10
+    ):
+        """Cluster the live rows with k-means into ``n_lists`` inverted lists."""
+        with self.lock:
+            vectors = self.vectors()
+            live_rows = np.flatnonzero(self.alive)
+            if len(live_rows) == 0:
+                return
+            n_lists = n_lists or max(1, int(np.sqrt(len(live_rows))))
+            n_lists = min(n_lists, len(live_rows))
+            rng = np.random.default_rng(0)
+            sample = rng.choice(
+                live_rows, size=min(len(live_rows), 256 * n_lists), replace=False
+            )
+            training = np.asarray(vectors[np.sort(sample)])
+            centroids = training[rng.choice(len(training), n_lists, replace=False)]
+            for _ in range(iterations):
+                labels = np.argmax(training @ centroids.T, axis=1)
+                for c in range(n_lists):
+                    members = training[labels == c]
+                    if len(members):
+                        centroids[c] = members.mean(axis=0)
+                centroids = _normalize(centroids)
+
+            assignments = np.empty(len(self.ids), dtype=np.int32)
+            for start in range(0, len(self.ids), 65536):
+                block = np.asarray(vectors[start : start + 65536])
+                assignments[start : start + len(block)] = np.argmax(
+                    block @ centroids.T, axis=1
+                )
+            # Retired rows are never returned; -1 keeps them out of every list.
+            assignments[~self.alive] = -1
+            self.centroids = centroids.astype(np.float32)
+            self.assignments = assignments
+            self.indexed_rows = len(assignments)
+            self.nprobe = nprobe
+            self._build_lists()
+            np.savez(
+                self.index_path,
+                centroids=self.centroids,
+                assignments=self.assignments,
+                nprobe=np.int32(nprobe),
+            )
+
+    def drop_index(self):
+        with self.lock:
+            self.centroids = None
+            self.assignments = None
+            self.indexed_rows = 0
+            self._list_order = None
+            self._list_bounds = None
+            if os.path.exists(self.index_path):
+                os.remove(self.index_path)
+
+    def compact(self):
+        """Rewrite the files keeping only live rows; drops the IVF index."""
+        with self.lock:
+            live_rows = np.flatnonzero(self.alive)
+            vectors = np.asarray(self.vectors()[live_rows])
+            ids = [self.ids[row] for row in live_rows]
+            payloads = [self.payloads[row] for row in live_rows]
+            self._mmap = None
+            self.drop_index()
+            tmp_vectors = f"{self.vectors_path}.tmp"
+            tmp_log = f"{self.log_path}.tmp"
+            with open(tmp_vectors, "wb") as f:
+                f.write(vectors.tobytes())
+            with open(tmp_log, "w", encoding="utf-8") as f:
+                for row, (point_id, payload) in enumerate(zip(ids, payloads)):
+                    f.write(
+                        json.dumps({"row": row, "id": point_id, "payload": payload})
+                        + "\n"
+                    )
+            os.replace(tmp_vectors, self.vectors_path)
+            os.replace(tmp_log, self.log_path)
+            self.ids = ids
+            self.payloads = payloads
+            self.row_of = {point_id: row for row, point_id in enumerate(ids)}
+            self.alive = np.ones(len(ids), dtype=bool)
+
+
+class LocalVectorStore:
+    """Embedded, on-disk vector store with QdrantDBClient's vector API.
+
+    Each collection is a memory-mapped float32 matrix searched with exact
+    cosine similarity (one matrix product per query batch). For large
+    collections ``build_index`` adds an IVF index that only scores the
+    ``nprobe`` closest clusters. Useful for offline development and as an
+    exact-search reference when checking Qdrant's recall and latency.
+    """
+
+    def __init__(
+        self,
+        collection_name: str,
+        path: str = "./data/vector_store",
+        vector_size: int = 768,
+    ):
+        """
+        Args:
+            collection_name (str): Default collection to use
+            path (str): Directory holding one sub-directory per collection
+            vector_size (int): Dimension of vectors in new collections
+        """
+        self.collection_name = collection_name
+        self.path = path
+        self.vector_size = vector_size
+        self.client = None
+        self._collections: Dict[str, _LocalCollection] = {}
+        self._lock = threading.Lock()
+
+    def connect_to_database(self) -> bool:
+        """Open the store directory (created if missing).
+
+        Returns:
+            bool: True if the store is usable, False otherwise
+        """
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            self.client = self
+            logging.info(f"✅ Local vector store opened at {self.path}")
+            return True
+        except Exception as e:
+            logging.error(f"❌ Local vector store error: {e}")
+            self.client = None
+            return False
+
+    def _collection(self, collection_name: Optional[str]) -> _LocalCollection:
+        name = collection_name or self.collection_name
+        with self._lock:
+            collection = self._collections.get(name)
+            if collection is None:
+                directory = os.path.join(self.path, name)
+                if not os.path.exists(os.path.join(directory, "meta.json")):
+                    raise ValueError(f"Collection '{name}' does not exist")
+                collection = _LocalCollection.load(name, directory)
+                self._collections[name] = collection
+            return collection
+
+    def create_collection(self, collection_name: Optional[str] = None) -> bool:
+        """Create a new, empty collection.
+
+        Args:
+            collection_name (Optional[str]): Name of collection to create
+
+        Returns:
+            bool: True if creation successful, False otherwise
+        """
+        name = collection_name or self.collection_name
+        directory = os.path.join(self.path, name)
+        try:
+            if os.path.exists(os.path.join(directory, "meta.json")):
+                raise ValueError(f"Collection '{name}' already exists")
+            with self._lock:
+                self._collections[name] = _LocalCollection.create(
+                    name, directory, self.vector_size
+                )
+            logging.info(f"✅ Collection '{name}' created successfully")
+            return True
+        except Exception as e:
+            logging.error(f"❌ Error creating collection: {e}")
+            return False
+
+    def insert_vectors(
+        self, points: List[Dict[str, Any]], collection_name: Optional[str] = None
+    ) -> bool:
+        """Insert (or replace) points with ``id``, ``vector`` and ``payload``.
+
+        Args:
+            points (List[Dict[str, Any]]): Points to insert
+            collection_name (Optional[str]): Target collection name
+
+        Returns:
+            bool: True if insertion successful, False otherwise
+        """
+        if not points:
+            return True
+        try:
+            collection = self._collection(collection_name)
+            vectors = np.asarray(
+                [point["vector"] for point in points], dtype=np.float32
+            )
+            if vectors.shape[1] != collection.vector_size:
+                raise ValueError(
+                    f"Vector dim {vectors.shape[1]} != {collection.vector_size}"
+                )
+            collection.upsert(
+                [point["id"] for point in points],
+                vectors,
+                [point.get("payload") or {} for point in points],
+            )
+            logging.info(f"✅ Successfully inserted {len(points)} vectors")
+            return True
+        except Exception as e:
+            logging.error(f"❌ Error inserting vectors: {e}")
+            return False
+
+    def search_vectors(
+        self,
+        query_vector: Union[np.ndarray, List[float]],
+        limit: int = 10,
+        collection_name: Optional[str] = None,
+        score_threshold: Optional[float] = None,
+        must: Optional[Dict[str, Any]] = None,
+        should: Optional[Dict[str, Any]] = None,
+        must_not: Optional[Dict[str, Any]] = None,
+        hnsw_ef: Optional[int] = None,
+        exact: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Search for similar vectors in collection.
+
+        Args:
+            query_vector (Union[np.ndarray, List[float]]): Vector to search for
+            limit (int): Maximum number of results
+            collection_name (Optional[str]): Target collection name
+            score_threshold (Optional[float]): Minimum cosine similarity
+            must, should, must_not (Optional[Dict[str, Any]]): Payload filter
+                clauses, as in ``QdrantDBClient.search_vectors``
+            hnsw_ef (Optional[int]): Accepted for API compatibility; unused
+            exact (bool): Ignore the IVF index and scan every point
+
+        Returns:
+            List[Dict[str, Any]]: Search results
+        """
+        return self.search_vectors_batch(
+            [query_vector],
+            limit,
+            collection_name,
+            score_threshold,
+            must=must,
+            should=should,
+            must_not=must_not,
+            hnsw_ef=hnsw_ef,
+            exact=exact,
+        )[0]
+
+    def search_vectors_batch(
+        self,
+        query_vectors: Union[np.ndarray, List[List[float]]],
+        limit: int = 10,
+        collection_name: Optional[str] = None,
+        score_threshold: Optional[float] = None,
+        must: Optional[Dict[str, Any]] = None,
+        should: Optional[Dict[str, Any]] = None,
+        must_not: Optional[Dict[str, Any]] = None,
+        hnsw_ef: Optional[int] = None,
+        exact: bool = False,
+    ) -> List[List[Dict[str, Any]]]:
+        """Search several query vectors at once.
+
+        Args:
+            query_vectors (Union[np.ndarray, List[List[float]]]): Vectors to search for
+            limit (int): Maximum number of results per query
+            collection_name (Optional[str]): Target collection name
+            score_threshold (Optional[float]): Minimum cosine similarity
+            must, should, must_not (Optional[Dict[str, Any]]): Payload filter
+                applied to every query
+            hnsw_ef (Optional[int]): Accepted for API compatibility; unused
+            exact (bool): Ignore the IVF index and scan every point
+
+        Returns:
+            List[List[Dict[str, Any]]]: Search results for each query, in order
+        """
+        if len(query_vectors) == 0:
+            return []
+        payload_filter = None
+        if must or should or must_not:
+
+            def payload_filter(payload: Dict[str, Any]) -> bool:
+                return payload_matches(payload, must, should, must_not)
+
+        try:
+            collection = self._collection(collection_name)
+            return collection.search(
+                np.asarray(query_vectors),
+                limit,
+                score_threshold,
+                payload_filter=payload_filter,
+                exact=exact,
+            )
+        except Exception as e:
+            logging.error(f"❌ Error searching vectors: {e}")
+            return [[] for _ in query_vectors]
+
+    def delete_vectors(
+        self, point_ids: List[PointId], collection_name: Optional[str] = None
+    ) -> bool:
+        """Delete vectors from collection.
+
+        Args:
+            point_ids (List[PointId]): IDs of points to delete
+            collection_name (Optional[str]): Target collection name
+
+        Returns:
+            bool: True if deletion successful, False otherwise
+        """
+        try:
+            self._collection(collection_name).delete(point_ids)
+            logging.info(f"✅ Successfully deleted {len(point_ids)} vectors")
+            return True
+        except Exception as e:
+            logging.error(f"❌ Error deleting vectors: {e}")
+            return False
+
+    def get_collection_info(
+        self, collection_name: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Get information about a collection.
+
+        Args:
+            collection_name (Optional[str]): Target collection name
+
+        Returns:
+            Dict[str, Any]: Collection information
+        """
+        try:
+            collection = self._collection(collection_name)
+            return {
+                "name": collection.name,
+                "vector_size": collection.vector_size,
+                "distance": "Cosine",
+                "points_count": collection.points_count,
+                "index": "ivf" if collection.centroids is not None else "exact",
+            }
+        except Exception as e:
+            logging.error(f"❌ Error getting collection info: {e}")
+            return {}
+
+    def build_index(
+        self,
+        collection_name: Optional[str] = None,
+        n_lists: Optional[int] = None,
+        nprobe: int = 8,
+    ) -> bool:
+        """Build (or rebuild) the approximate IVF index of a collection.
+
+        Args:
+            collection_name (Optional[str]): Target collection name
+            n_lists (Optional[int]): Number of clusters; sqrt(points) if None
+            nprobe (int): Clusters scanned per query; higher is more exact
+
+        Returns:
+            bool: True if the index was built, False otherwise
+        """
+        try:
+            self._collection(collection_name).build_ivf_index(n_lists, nprobe)
+            logging.info("✅ IVF index built")
+            return True
+        except Exception as e:
+            logging.error(f"❌ Error building index: {e}")
+            return False
+
+    def compact(self, collection_name: Optional[str] = None) -> bool:
+        """Reclaim space of deleted/replaced points (drops the IVF index)."""
+        try:
+            self._collection(collection_name).compact()
+            return True
+        except Exception as e:
+            logging.error(f"❌ Error compacting collection: {e}")
+            return False
+
+    def delete_collection(self, collection_name: Optional[str] = None) -> bool:
+        """Delete a collection and its files."""
+        name = collection_name or self.collection_name
+        try:
+            with self._lock:
+                self._collections.pop(name, None)
+            shutil.rmtree(os.path.join(self.path, name))
+            logging.info(f"✅ Collection '{name}' deleted successfully")
+            return True
+        except Exception as e:
+            logging.error(f"❌ Error deleting collection: {e}")
+            return False
+
+    def close_connection(self):
+        """Release open memory maps."""
+        with self._lock:
+            self._collections.clear()
+        self.client = None
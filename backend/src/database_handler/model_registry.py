@@ -0,0 +1,86 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+
+class ModelRegistry:
+    """Process-wide registry of lazily loaded models.
+
+    Models are loaded on first use and shared by every handler asking for
+    the same key, so one worker holds a single copy of each model no matter
+    how many QdrantDBClient, DocumentParser or chunker instances exist.
+    """
+
+    def __init__(self):
+        self._models: Dict[str, Any] = {}
+        self._load_times: Dict[str, float] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._registry_lock = threading.Lock()
+
+    def _lock_for(self, key: str) -> threading.Lock:
+        with self._registry_lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def get_or_load(self, key: str, loader: Callable[[], Any]) -> Any:
+        """Return the model stored under ``key``, loading it on first use.
+
+        Args:
+            key (str): Unique model key, e.g. ``sentence-transformers/<name>``
+            loader (Callable[[], Any]): Zero-argument function building the model
+
+        Returns:
+            Any: The shared model instance
+        """
+        model = self._models.get(key)
+        if model is not None:
+            return model
+
+        with self._lock_for(key):
+            model = self._models.get(key)
+            if model is None:
+                start = time.perf_counter()
+                model = loader()
+                elapsed = time.perf_counter() - start
+                self._models[key] = model
+                self._load_times[key] = elapsed
+                logging.info(f"✅ Loaded model '{key}' in {elapsed:.2f}s")
+        return model
+
+    def is_loaded(self, key: str) -> bool:
+        return key in self._models
+
+    def load_times(self) -> Dict[str, float]:
+        """Seconds spent loading each model, keyed by model key."""
+        return dict(self._load_times)
+
+    def preload(
+        self, loaders: Iterable[Callable[[], Any]], background: bool = True
+    ) -> Optional[threading.Thread]:
+        """Warm models ahead of the first request.
+
+        Args:
+            loaders (Iterable[Callable[[], Any]]): Callables that trigger loading
+            background (bool): Run in a daemon thread instead of blocking
+
+        Returns:
+            Optional[threading.Thread]: The preload thread when run in background
+        """
+        loaders = list(loaders)
+
+        def _run():
+            for loader in loaders:
+                try:
+                    loader()
+                except Exception as e:
+                    logging.error(f"❌ Error preloading model: {e}")
+
+        if not background:
+            _run()
+            return None
+        thread = threading.Thread(target=_run, name="model-preload", daemon=True)
+        thread.start()
+        return thread
+
+
+model_registry = ModelRegistry()
@@ -1,15 +1,41 @@
+import asyncio
 import atexit
 import datetime
 import logging
-from typing import Any, Dict, List, Optional
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 
-from pymongo import MongoClient
-from pymongo.errors import ServerSelectionTimeoutError
+from pymongo import MongoClient, UpdateOne
+from pymongo.errors import BulkWriteError, ServerSelectionTimeoutError
 
 from src.app_config import app_config
 from src.schema import ConversationInfor, Message, UserThread
 
 
+def build_mongo_uri() -> str:
+    """Return MONGODB_URI or build one from the individual credentials."""
+    mongo_uri = app_config.MONGODB_URI
+    if not mongo_uri:
+        if not all(
+            [
+                app_config.MONGOUSER,
+                app_config.MONGOPASSWORD,
+                app_config.MONGOHOST,
+                app_config.MONGOPORT,
+            ]
+        ):
+            raise ValueError("❌ Missing MongoDB credentials to construct URI.")
+
+        mongo_uri = (
+            f"mongodb://{app_config.MONGOUSER}:{app_config.MONGOPASSWORD}"
+            f"@{app_config.MONGOHOST}:{app_config.MONGOPORT}"
+            f"/?authSource=admin"
+        )
+    return mongo_uri
+
+
 class BaseMongoDBHandler:
     def __init__(self, db_name: str, collection_name: str):
         """Initialize MongoDB connection."""
@@ -24,26 +50,7 @@ class BaseMongoDBHandler:
         """Establish a connection to MongoDB."""
         try:
             if not self.client:
-                mongo_uri = app_config.MONGODB_URI
-                if not mongo_uri:
-                    if not all(
-                        [
-                            app_config.MONGOUSER,
-                            app_config.MONGOPASSWORD,
-                            app_config.MONGOHOST,
-                            app_config.MONGOPORT,
-                        ]
-                    ):
-                        raise ValueError(
-                            "❌ Missing MongoDB credentials to construct URI."
-                        )
-
-                    mongo_uri = (
-                        f"mongodb://{app_config.MONGOUSER}:{app_config.MONGOPASSWORD}"
-                        f"@{app_config.MONGOHOST}:{app_config.MONGOPORT}"
-                        f"/?authSource=admin"
-                    )
-                self.client = MongoClient(mongo_uri)
+                self.client = MongoClient(build_mongo_uri())
                 self.db = self.client[self.db_name]
                 self.collection = self.db[self.collection_name]
                 print("MongoDB connection established.")
@@ -219,9 +226,120 @@ class BaseMongoDBHandler:
                 self.connect_to_database()
 
 
-class MemoryHandler(BaseMongoDBHandler):
-    def __init__(self, db_name: str, collection_name: str):
+class ConversationDocumentMixin:
+    """Builders for the conversation and archive documents.
+
+    Shared by the sync and async memory handlers so both write the same
+    document shape. Expects ``max_messages`` and ``archive_bucket_size``.
+    """
+
+    @staticmethod
+    def _thread_filter(thread_infor: UserThread) -> Dict[str, Any]:
+        return {
+            "user_id": thread_infor.user_id,
+            "thread_id": thread_infor.thread_id,
+            "agent_name": thread_infor.agent_name,
+        }
+
+    @staticmethod
+    def _messages_as_dicts(messages: List[Message]) -> List[Dict[str, Any]]:
+        return [
+            {
+                "role": msg.role,
+                "content": msg.content,
+                "time_created": (
+                    msg.time_created
+                    if hasattr(msg, "time_created")
+                    else datetime.datetime.now(datetime.UTC)
+                ),
+            }
+            for msg in messages
+        ]
+
+    def _conversation_update(
+        self, thread_filter: Dict[str, Any], messages: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Build the capped ``$push`` upsert for the live conversation."""
+        return {
+            "$setOnInsert": {
+                **thread_filter,
+                "created_at": datetime.datetime.now(datetime.UTC),
+            },
+            "$push": {
+                "messages": {
+                    "$each": messages,
+                    "$slice": -self.max_messages,
+                }
+            },
+        }
+
+    def _archive_update(
+        self, thread_filter: Dict[str, Any], messages: List[Dict[str, Any]]
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Build the (filter, update) pair appending to the open archive bucket.
+
+        A bucket only matches while ``count`` is below the bucket size, so the
+        upsert starts a new bucket document once the current one is full.
+        """
+        return (
+            {**thread_filter, "count": {"$lt": self.archive_bucket_size}},
+            {
+                "$setOnInsert": {
+                    **thread_filter,
+                    "created_at": datetime.datetime.now(datetime.UTC),
+                },
+                "$push": {"messages": {"$each": messages}},
+                "$inc": {"count": len(messages)},
+            },
+        )
+
+
+class MemoryHandler(ConversationDocumentMixin, BaseMongoDBHandler):
+    def __init__(
+        self,
+        db_name: str,
+        collection_name: str,
+        max_messages: int = 50,
+        archive_collection_name: Optional[str] = None,
+        archive_bucket_size: int = 200,
+    ):
+        """Conversation memory stored as one capped document per thread.
+
+        Args:
+            db_name (str): MongoDB database name
+            collection_name (str): Collection holding the live conversations
+            max_messages (int): Messages kept on the live document; older ones
+                are trimmed by the ``$slice`` on every write
+            archive_collection_name (Optional[str]): If set, every turn is also
+                appended to bucket documents in this collection so trimmed
+                messages are not lost
+            archive_bucket_size (int): Messages per archive bucket before a new
+                one is started
+        """
         super().__init__(db_name, collection_name)
+        self.max_messages = max_messages
+        self.archive_collection_name = archive_collection_name
+        self.archive_bucket_size = archive_bucket_size
+
+    @property
+    def archive_collection(self):
+        if self.db is None or not self.archive_collection_name:
+            return None
+        return self.db[self.archive_collection_name]
+
+    def create_indexes(self):
+        """Create the compound thread indexes used by every memory lookup."""
+        if self.collection is None:
+            print("No database connection")
+            return
+
+        thread_key = [("user_id", 1), ("thread_id", 1), ("agent_name", 1)]
+        self.collection.create_index(thread_key, name="user_thread_agent")
+        if self.archive_collection is not None:
+            self.archive_collection.create_index(
+                thread_key + [("count", 1)], name="user_thread_agent_bucket"
+            )
+        print("MongoDB memory indexes ensured.")
 
     def clear_collection(self):
         """Clear all documents from the collection."""
@@ -261,58 +379,54 @@ class MemoryHandler(BaseMongoDBHandler):
             print("No messages provided. Skipping update.")
             return
 
-        messages_as_dicts = [
-            {
-                "role": msg.role,
-                "content": msg.content,
-                "time_created": (
-                    msg.time_created
-                    if hasattr(msg, "time_created")
-                    else datetime.datetime.now(datetime.UTC)
-                ),
-            }
-            for msg in conversation_infor.messages
-        ]
-
+        messages_as_dicts = self._messages_as_dicts(conversation_infor.messages)
+        thread_filter = self._thread_filter(conversation_infor.user_thread_infor)
         result = self.collection.update_one(
-            {
-                "user_id": conversation_infor.user_thread_infor.user_id,
-                "thread_id": conversation_infor.user_thread_infor.thread_id,
-                "agent_name": conversation_infor.user_thread_infor.agent_name,
-            },
-            {
-                "$setOnInsert": {
-                    "user_id": conversation_infor.user_thread_infor.user_id,
-                    "thread_id": conversation_infor.user_thread_infor.thread_id,
-                    "agent_name": conversation_infor.user_thread_infor.agent_name,
-                    "created_at": datetime.datetime.now(datetime.UTC),
-                },
-                "$push": {
-                    "messages": {
-                        "$each": messages_as_dicts,
-                        # "$slice": -50,  # Keeps only the last 50 messages
-                    }
-                },
-            },
+            thread_filter,
+            self._conversation_update(thread_filter, messages_as_dicts),
             upsert=True,
         )
+        self._archive_messages(thread_filter, messages_as_dicts)
 
         if result.upserted_id:
             print("New conversation inserted.")
         else:
-            print("Conversation updated, keeping only the last 50 messages.")
+            print(
+                f"Conversation updated, keeping only the last {self.max_messages} messages."
+            )
+
+    def _archive_messages(
+        self, thread_filter: Dict[str, Any], messages: List[Dict[str, Any]]
+    ):
+        """Append messages to the thread's open archive bucket."""
+        if self.archive_collection is None:
+            return
 
-    def retrieve_conversation(self, thread_infor: UserThread) -> ConversationInfor:
+        bucket_filter, update = self._archive_update(thread_filter, messages)
+        self.archive_collection.update_one(bucket_filter, update, upsert=True)
+
+    def retrieve_conversation(
+        self, thread_infor: UserThread, last_k: Optional[int] = None
+    ) -> ConversationInfor:
+        """Fetch a conversation, optionally only its last ``last_k`` messages.
+
+        The slice is applied as a server-side projection so long threads do
+        not ship their full history on every turn.
+        """
         if self.collection is None:
             print("No database connection")
             return {}
 
+        projection = None
+        if last_k is not None:
+            projection = {"messages": {"$slice": -last_k}}
         conversation = self.collection.find_one(
             {
                 "user_id": thread_infor.user_id,
                 "thread_id": thread_infor.thread_id,
                 "agent_name": thread_infor.agent_name,
-            }
+            },
+            projection,
         )
         if conversation:
             conversation["_id"] = str(conversation["_id"])  # Convert ObjectId to string
@@ -342,6 +456,327 @@ class MemoryHandler(BaseMongoDBHandler):
             raise ValueError(f"Malformed message data. Missing key: {e}")
 
 
+class CachedMemoryHandler(MemoryHandler):
+    """MemoryHandler with an in-process read cache and write-behind queue.
+
+    Recent messages of hot threads are served from an LRU/TTL cache, and
+    conversation writes are queued and flushed with ``bulk_write`` once
+    ``flush_batch_size`` threads are pending or every ``flush_interval``
+    seconds. Pending writes are flushed when the connection is closed.
+    Only writes that failed are retried by the next flush, since ``$push``
+    is not idempotent.
+
+    The ``a*`` methods serve the same cache from the event loop: hits and
+    queued writes never block, and cache misses are read through an
+    AsyncMemoryHandler (motor) when one is given.
+    """
+
+    def __init__(
+        self,
+        db_name: str,
+        collection_name: str,
+        max_messages: int = 50,
+        archive_collection_name: Optional[str] = None,
+        archive_bucket_size: int = 200,
+        cache_size: int = 1024,
+        cache_ttl: float = 600.0,
+        flush_batch_size: int = 100,
+        flush_interval: float = 1.0,
+        async_handler: Optional[Any] = None,
+    ):
+        """
+        Args:
+            db_name (str): MongoDB database name
+            collection_name (str): Collection holding the live conversations
+            max_messages (int): Messages kept on the live document and cached
+            archive_collection_name (Optional[str]): Optional archive bucket collection
+            archive_bucket_size (int): Messages per archive bucket
+            cache_size (int): Threads kept in the read cache
+            cache_ttl (float): Seconds a cached thread stays valid
+            flush_batch_size (int): Pending threads that trigger a flush
+            flush_interval (float): Seconds between background flushes
+            async_handler (Optional[Any]): Connected AsyncMemoryHandler used
+                for cache-miss reads by aretrieve_conversation; without it
+                they run the pymongo read in a worker thread
+        """
+        super().__init__(
+            db_name,
+            collection_name,
+            max_messages=max_messages,
+            archive_collection_name=archive_collection_name,
+            archive_bucket_size=archive_bucket_size,
+        )
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self.flush_batch_size = flush_batch_size
+        self.flush_interval = flush_interval
+        self.async_handler = async_handler
+        self._cache: (
+            "OrderedDict[Tuple[str, ...], Tuple[float, List[Dict[str, Any]]]]"
+        ) = OrderedDict()
+        self._pending: "OrderedDict[Tuple[str, ...], List[Dict[str, Any]]]" = (
+            OrderedDict()
+        )
+        # Archive appends whose live write already succeeded.
+        self._pending_archive: "OrderedDict[Tuple[str, ...], List[Dict[str, Any]]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.RLock()
+        # Serializes flushes, and cache-miss reads against in-flight flushes.
+        self._flush_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        # Wakes the flusher early; set instead of flushing on the event loop.
+        self._flush_requested = threading.Event()
+        self._flush_thread = threading.Thread(
+            target=self._flush_loop, name="memory-write-behind", daemon=True
+        )
+        self._flush_thread.start()
+
+    @staticmethod
+    def _cache_key(thread_filter: Dict[str, Any]) -> Tuple[str, ...]:
+        return (
+            thread_filter["user_id"],
+            thread_filter["thread_id"],
+            thread_filter["agent_name"],
+        )
+
+    def _cache_get(self, key: Tuple[str, ...]) -> Optional[List[Dict[str, Any]]]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        stored_at, messages = entry
+        if time.monotonic() - stored_at > self.cache_ttl:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return messages
+
+    def _cache_put(self, key: Tuple[str, ...], messages: List[Dict[str, Any]]):
+        self._cache[key] = (time.monotonic(), messages[-self.max_messages :])
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def retrieve_conversation(
+        self, thread_infor: UserThread, last_k: Optional[int] = None
+    ) -> ConversationInfor:
+        thread_filter = self._thread_filter(thread_infor)
+        key = self._cache_key(thread_filter)
+        with self._lock:
+            messages = self._cache_get(key)
+        if messages is None:
+            # With no flush in flight, the stored history plus the still
+            # pending turns is the full conversation.
+            with self._flush_lock:
+                conversation = super().retrieve_conversation(
+                    thread_infor, last_k=self.max_messages
+                )
+                messages = conversation.get("messages", []) if conversation else []
+                with self._lock:
+                    messages = messages + self._pending.get(key, [])
+                    if self.collection is not None:
+                        self._cache_put(key, messages)
+        if not messages:
+            return {}
+        if last_k is not None:
+            messages = messages[-last_k:]
+        return {**thread_filter, "messages": list(messages)}
+
+    def insert_or_update_conversation(self, conversation_infor: ConversationInfor):
+        if not conversation_infor.messages:
+            print("No messages provided. Skipping update.")
+            return
+
+        messages_as_dicts = self._messages_as_dicts(conversation_infor.messages)
+        thread_filter = self._thread_filter(conversation_infor.user_thread_infor)
+        key = self._cache_key(thread_filter)
+        with self._lock:
+            cached = self._cache_get(key)
+            if cached is not None:
+                self._cache_put(key, cached + messages_as_dicts)
+            self._pending.setdefault(key, []).extend(messages_as_dicts)
+            should_flush = len(self._pending) >= self.flush_batch_size
+        if should_flush:
+            self.flush()
+
+    async def aretrieve_conversation(
+        self, thread_infor: UserThread, last_k: Optional[int] = None
+    ) -> ConversationInfor:
+        """Async retrieve_conversation; cache misses are read with motor."""
+        if self.async_handler is None:
+            return await asyncio.to_thread(
+                self.retrieve_conversation, thread_infor, last_k
+            )
+        thread_filter = self._thread_filter(thread_infor)
+        key = self._cache_key(thread_filter)
+        with self._lock:
+            messages = self._cache_get(key)
+        if messages is None:
+            # Same invariant as retrieve_conversation: no flush may be in
+            # flight during the read. Poll so the event loop is never blocked.
+            while not self._flush_lock.acquire(blocking=False):
+                await asyncio.sleep(0.005)
+            try:
+                conversation = await self.async_handler.retrieve_conversation(
+                    thread_infor, last_k=self.max_messages
+                )
+                messages = conversation.get("messages", []) if conversation else []
+                with self._lock:
+                    messages = messages + self._pending.get(key, [])
+                    if self.async_handler.collection is not None:
+                        self._cache_put(key, messages)
+            finally:
+                self._flush_lock.release()
+        if not messages:
+            return {}
+        if last_k is not None:
+            messages = messages[-last_k:]
+        return {**thread_filter, "messages": list(messages)}
+
+    async def ainsert_or_update_conversation(
+        self, conversation_infor: ConversationInfor
+    ):
+        """Queue a turn without blocking; a full queue wakes the flusher."""
+        if not conversation_infor.messages:
+            print("No messages provided. Skipping update.")
+            return
+
+        messages_as_dicts = self._messages_as_dicts(conversation_infor.messages)
+        thread_filter = self._thread_filter(conversation_infor.user_thread_infor)
+        key = self._cache_key(thread_filter)
+        with self._lock:
+            cached = self._cache_get(key)
+            if cached is not None:
+                self._cache_put(key, cached + messages_as_dicts)
+            self._pending.setdefault(key, []).extend(messages_as_dicts)
+            if len(self._pending) >= self.flush_batch_size:
+                self._flush_requested.set()
+
+    @staticmethod
+    def _thread_filter_from_key(key: Tuple[str, ...]) -> Dict[str, Any]:
+        return dict(zip(("user_id", "thread_id", "agent_name"), key))
+
+    @staticmethod
+    def _bulk_write_failures(collection, operations: List[UpdateOne]) -> set:
+        """Run an unordered ``bulk_write`` and return the indexes that failed."""
+        try:
+            collection.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            # Unordered: every operation not listed here was applied.
+            return {error["index"] for error in e.details.get("writeErrors", [])}
+        except Exception as e:
+            print(f"❌ Error flushing conversations: {e}")
+            return set(range(len(operations)))
+        return set()
+
+    @staticmethod
+    def _requeue(
+        queue: "OrderedDict[Tuple[str, ...], List[Dict[str, Any]]]",
+        key: Tuple[str, ...],
+        messages: List[Dict[str, Any]],
+        older: bool = True,
+    ):
+        """Queue ``messages`` before (``older``) or after the queued ones."""
+        queued = queue.get(key, [])
+        queue[key] = messages + queued if older else queued + messages
+
+    def flush(self) -> int:
+        """Write all pending conversation turns with one ``bulk_write`` call.
+
+        Returns:
+            int: Number of threads flushed
+        """
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending and not self._pending_archive:
+                    return 0
+                if self.collection is None:
+                    print("No database connection")
+                    return 0
+                pending = self._pending
+                pending_archive = self._pending_archive
+                self._pending = OrderedDict()
+                self._pending_archive = OrderedDict()
+
+            keys = list(pending)
+            operations = [
+                UpdateOne(
+                    self._thread_filter_from_key(key),
+                    self._conversation_update(
+                        self._thread_filter_from_key(key), pending[key]
+                    ),
+                    upsert=True,
+                )
+                for key in keys
+            ]
+            failed = (
+                self._bulk_write_failures(self.collection, operations)
+                if operations
+                else set()
+            )
+            failed_keys = {keys[index] for index in failed}
+
+            if self.archive_collection is not None:
+                # Threads whose live write failed are archived on retry.
+                for key in keys:
+                    if key not in failed_keys:
+                        self._requeue(pending_archive, key, pending[key], older=False)
+                self._flush_archive(pending_archive)
+
+            with self._lock:
+                for key in keys:
+                    if key in failed_keys:
+                        self._requeue(self._pending, key, pending[key])
+            flushed = len(keys) - len(failed_keys)
+            if failed_keys:
+                print(f"❌ {len(failed_keys)} conversations failed to flush.")
+            if flushed:
+                print(f"✅ Flushed {flushed} conversations.")
+            return flushed
+
+    def _flush_archive(
+        self, pending_archive: "OrderedDict[Tuple[str, ...], List[Dict[str, Any]]]"
+    ):
+        """Append to the archive, re-queueing only the buckets that failed."""
+        if not pending_archive:
+            return
+        keys = list(pending_archive)
+        operations = []
+        for key in keys:
+            bucket_filter, update = self._archive_update(
+                self._thread_filter_from_key(key), pending_archive[key]
+            )
+            operations.append(UpdateOne(bucket_filter, update, upsert=True))
+        failed = self._bulk_write_failures(self.archive_collection, operations)
+        with self._lock:
+            for index in sorted(failed):
+                self._requeue(
+                    self._pending_archive, keys[index], pending_archive[keys[index]]
+                )
+
+    def _flush_loop(self):
+        while not self._stop_event.is_set():
+            self._flush_requested.wait(self.flush_interval)
+            self._flush_requested.clear()
+            if self._stop_event.is_set():
+                return
+            self.flush()
+
+    def close_connection(self):
+        """Flush pending writes before closing the connection."""
+        if self.collection is not None:
+            self.flush()
+        super().close_connection()
+
+    def shutdown(self):
+        """Stop the background flusher and close with a final flush."""
+        self._stop_event.set()
+        self._flush_requested.set()
+        self.close_connection()
+        if self.async_handler is not None:
+            self.async_handler.close_connection()
+
+
 class MongoDBHandler(BaseMongoDBHandler):
     def __init__(self, db_name: str = None, collection_name: str = None):
         db_name = db_name or app_config.MONGODB_DB_NAME
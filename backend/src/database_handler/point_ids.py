@@ -0,0 +1,16 @@
+import hashlib
+
+
+def hash_point_id(identifier: str) -> int:
+    """Deterministic unsigned 64-bit point ID for an identifier string.
+
+    64 bits keep the expected number of collisions negligible even for
+    hundreds of millions of points, and fit Qdrant's integer point IDs.
+    """
+    digest = hashlib.blake2b(identifier.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def legacy_doc_id(identifier: str) -> int:
+    """The pre-64-bit point ID scheme (MD5 modulo 1,000,000)."""
+    return int(hashlib.md5(identifier.encode()).hexdigest(), 16) % 1000000
@@ -1,25 +1,240 @@
+import hashlib
+import json
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Union
 import os
-from qdrant_client import QdrantClient as QClient
-from qdrant_client.http.models import Distance, PointIdsList, VectorParams
-import hashlib
+from qdrant_client.http.models import (
+    BinaryQuantization,
+    BinaryQuantizationConfig,
+    Distance,
+    FieldCondition,
+    Filter,
+    Fusion,
+    FusionQuery,
+    HnswConfigDiff,
+    MatchAny,
+    MatchValue,
+    Modifier,
+    NamedVector,
+    PayloadSchemaType,
+    PointIdsList,
+    PointStruct,
+    Prefetch,
+    QuantizationSearchParams,
+    QueryRequest,
+    Range,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+    SearchRequest,
+    SparseVector,
+    SparseVectorParams,
+    VectorParams,
+)
+
+import numpy as np
 
 from src.app_config import app_config
 
+from .connections import get_s3_client, qdrant_client_pool, retry_with_backoff
 from .document_parser import DocumentParser
 from .embedding_handler import EmbeddingHandler
+from .ingestion_manifest import IngestionManifest
+from .ingestion_pipeline import IngestionPipeline
+from .model_registry import model_registry
+from .point_ids import hash_point_id, legacy_doc_id
 from .search_handler import SearchHandler
+from .sparse_embedding_handler import SparseEmbeddingHandler
 from .chunk_document import (
     ChunkDocument,
     SemanticChunkingStrategy,
     SentenceChunkingStrategy,
     SimpleChunkingStrategy,
 )  # adjust import as needed
-import boto3
 from datetime import datetime
 
 
+def to_qdrant_vector(vector: Union[np.ndarray, List[float]]) -> List[float]:
+    """Convert an embedding to the plain list the Qdrant client serialises."""
+    if isinstance(vector, np.ndarray):
+        return vector.astype(np.float32, copy=False).tolist()
+    return vector
+
+
+# Vector names used by hybrid (dense + sparse) collections.
+DENSE_VECTOR_NAME = "dense"
+SPARSE_VECTOR_NAME = "sparse"
+
+
+def to_point_struct(
+    point: Dict[str, Any], dense_vector_name: Optional[str] = None
+) -> PointStruct:
+    """Build the client PointStruct from an ``id``/``vector``/``payload`` dict.
+
+    With ``dense_vector_name`` set (hybrid collections) the dense vector is
+    stored under that name, next to the point's ``sparse_vector`` if any.
+    """
+    vector = to_qdrant_vector(point["vector"])
+    if dense_vector_name:
+        vector = {dense_vector_name: vector}
+        if point.get("sparse_vector") is not None:
+            vector[SPARSE_VECTOR_NAME] = point["sparse_vector"]
+    return PointStruct(
+        id=point["id"], vector=vector, payload=point.get("payload") or {}
+    )
+
+
+# Payload fields filtered on by retrieval; indexed when a collection is created.
+PAYLOAD_INDEXES: Dict[str, PayloadSchemaType] = {
+    "filename": PayloadSchemaType.KEYWORD,
+    "source_type": PayloadSchemaType.KEYWORD,
+    "chunk_index": PayloadSchemaType.INTEGER,
+}
+
+
+def _field_condition(key: str, value: Any) -> FieldCondition:
+    if isinstance(value, dict):
+        return FieldCondition(key=key, range=Range(**value))
+    if isinstance(value, (list, tuple, set)):
+        return FieldCondition(key=key, match=MatchAny(any=list(value)))
+    return FieldCondition(key=key, match=MatchValue(value=value))
+
+
+def build_payload_filter(
+    must: Optional[Dict[str, Any]] = None,
+    should: Optional[Dict[str, Any]] = None,
+    must_not: Optional[Dict[str, Any]] = None,
+) -> Optional[Filter]:
+    """Build a Qdrant filter from ``{payload_key: condition}`` clauses.
+
+    A condition is a value (exact match), a list (match any) or a dict of
+    ``gt``/``gte``/``lt``/``lte`` bounds (range), e.g.
+    ``must={"source_type": "markdown", "chunk_index": {"lt": 3}}``.
+
+    Returns:
+        Optional[Filter]: The filter, or None when no clause is given
+    """
+    if not (must or should or must_not):
+        return None
+
+    def conditions(clauses: Optional[Dict[str, Any]]):
+        if not clauses:
+            return None
+        return [_field_condition(key, value) for key, value in clauses.items()]
+
+    return Filter(
+        must=conditions(must), should=conditions(should), must_not=conditions(must_not)
+    )
+
+
+def build_search_params(
+    hnsw_ef: Optional[int] = None,
+    exact: bool = False,
+    oversampling: Optional[float] = None,
+    rescore: Optional[bool] = None,
+) -> Optional[SearchParams]:
+    """Search parameters, or None to use the collection defaults.
+
+    ``oversampling``/``rescore`` only apply to quantized collections: the
+    quantized index returns ``limit * oversampling`` candidates, which are
+    re-scored with the original vectors before the top ``limit`` are kept.
+    """
+    quantization = None
+    if oversampling is not None or rescore is not None:
+        quantization = QuantizationSearchParams(
+            rescore=rescore, oversampling=oversampling
+        )
+    if hnsw_ef is None and not exact and quantization is None:
+        return None
+    return SearchParams(hnsw_ef=hnsw_ef, exact=exact, quantization=quantization)
+
+
+def build_quantization_config(
+    quantization: Optional[str],
+) -> Optional[Union[ScalarQuantization, BinaryQuantization]]:
+    """Quantization config for ``"scalar"`` (int8), ``"binary"`` or None.
+
+    Quantized vectors are kept in RAM (``always_ram``) so they can be
+    searched without touching the original vectors, which may be on disk.
+    """
+    if not quantization:
+        return None
+    if quantization == "scalar":
+        return ScalarQuantization(
+            scalar=ScalarQuantizationConfig(
+                type=ScalarType.INT8, quantile=0.99, always_ram=True
+            )
+        )
+    if quantization == "binary":
+        return BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=True))
+    raise ValueError(
+        f"Unknown quantization '{quantization}', expected 'scalar' or 'binary'"
+    )
+
+
+# Upper bound on chunk numbers tried when recovering a legacy chunk ID.
+LEGACY_MAX_CHUNKS = 10000
+
+
+def point_identifier(
+    payload: Dict[str, Any],
+    point_id: Any = None,
+    legacy_chunks: Optional[Dict[str, Dict[int, List[int]]]] = None,
+) -> Optional[str]:
+    """Rebuild the string a point's ID was hashed from, using its payload.
+
+    Markdown chunks are keyed ``{filename}_chunk_{i}``; whole documents by
+    ``filename`` (plus ``_row_{i}`` for CSV rows). Chunks ingested before
+    ``chunk_index`` was stored only carry ``filename``; their ``i`` is
+    recovered by matching ``point_id`` against the legacy ID of each
+    candidate key. Candidates must lie below the payload's ``total_chunks``;
+    if several remain, the highest wins, because chunks were upserted in
+    order and a colliding later chunk overwrote the earlier one. Without
+    ``total_chunks`` an ambiguous match is left unresolved. Returns None
+    when the identifier cannot be determined.
+
+    Args:
+        payload (Dict[str, Any]): Point payload
+        point_id (Any): Current point ID, used to recover legacy chunk keys
+        legacy_chunks (Optional[Dict[str, Dict[int, List[int]]]]): Per-filename
+            cache of legacy chunk ID to the chunk numbers producing it
+    """
+    filename = payload.get("filename")
+    if not filename:
+        return None
+    if payload.get("chunk_index") is not None:
+        return f"{filename}_chunk_{payload['chunk_index']}"
+    if payload.get("row_index") is not None:
+        return f"{filename}_row_{payload['row_index']}"
+    if point_id is None:
+        return None
+    if point_id == legacy_doc_id(filename):
+        return filename
+    if legacy_chunks is None:
+        legacy_chunks = {}
+    if filename not in legacy_chunks:
+        chunks: Dict[int, List[int]] = {}
+        for i in range(LEGACY_MAX_CHUNKS):
+            chunks.setdefault(legacy_doc_id(f"{filename}_chunk_{i}"), []).append(i)
+        legacy_chunks[filename] = chunks
+    candidates = legacy_chunks[filename].get(point_id, [])
+    total_chunks = payload.get("total_chunks")
+    if total_chunks is not None:
+        candidates = [i for i in candidates if i < total_chunks]
+    elif len(candidates) > 1:
+        return None
+    if not candidates:
+        return None
+    return f"{filename}_chunk_{candidates[-1]}"
+
+
+def payload_digest(payload: Optional[Dict[str, Any]]) -> str:
+    """Stable digest of a payload, used to recognise already moved points."""
+    encoded = json.dumps(payload or {}, sort_keys=True, default=str)
+    return hashlib.blake2b(encoded.encode("utf-8"), digest_size=16).hexdigest()
+
+
 class QdrantDBClient:
     def __init__(self, collection_name: str):
         """Initialize Qdrant client with all necessary components.
@@ -28,29 +243,114 @@ class QdrantDBClient:
             collection_name (str): Name of the Qdrant collection to use
         """
         self.collection_name = collection_name
-        self.vector_size = 768
+        # nomic-embed-text-v1.5 is 768-d; EMBEDDING_DIM enables Matryoshka
+        # truncation and must match the collection's vector size.
+        self.vector_size = app_config.EMBEDDING_DIM or 768
         self.client = None
-        self.embedding_handler = EmbeddingHandler()
+        self._client_key = None
+        self.payload_indexes = dict(PAYLOAD_INDEXES)
+        # Default oversampling for quantized collections (QDRANT_OVERSAMPLING).
+        self.oversampling = app_config.QDRANT_OVERSAMPLING
+        self.max_retries = (
+            app_config.QDRANT_MAX_RETRIES
+            if app_config.QDRANT_MAX_RETRIES is not None
+            else 3
+        )
+        self.last_ingestion_stats: Dict[str, Any] = {}
+        self.embedding_handler = EmbeddingHandler(
+            backend=app_config.EMBEDDING_BACKEND or "torch",
+            output_dim=app_config.EMBEDDING_DIM,
+            cache_dir=app_config.EMBEDDING_CACHE_DIR,
+            micro_batching=bool(app_config.EMBEDDING_MICRO_BATCHING),
+        )
+        # Hybrid collections store a named dense vector plus a sparse
+        # (BM25/SPLADE) vector and are searched with RRF fusion.
+        self.hybrid = bool(app_config.HYBRID_SEARCH)
+        self.dense_vector_name = DENSE_VECTOR_NAME if self.hybrid else None
+        self.sparse_embedding_handler = (
+            SparseEmbeddingHandler(app_config.SPARSE_EMBEDDING_MODEL or "Qdrant/bm25")
+            if self.hybrid
+            else None
+        )
         self.document_parser = DocumentParser()
-        self.search_handler = SearchHandler(self.embedding_handler)
-        semantic_strategy = SemanticChunkingStrategy(
-            model_name="all-MiniLM-L6-v2", similarity_threshold=0.75
+        self.search_handler = SearchHandler(
+            self.embedding_handler,
+            max_length=app_config.RERANK_MAX_LENGTH or 512,
+            rerank_workers=app_config.RERANK_WORKERS or 4,
         )
         # sentence_strategy = SentenceChunkingStrategy()
         simple_strategy = SimpleChunkingStrategy()
         self.chunker = ChunkDocument(strategy=simple_strategy)
 
+    def preload_models(self, background: bool = True):
+        """Load the query-path models (embedder and reranker) ahead of use.
+
+        Args:
+            background (bool): Load in a daemon thread instead of blocking
+
+        Returns:
+            Optional[threading.Thread]: The preload thread when run in background
+        """
+        loaders = [self.embedding_handler.load_model, self.search_handler.load_model]
+        if self.sparse_embedding_handler is not None:
+            loaders.append(self.sparse_embedding_handler.load_model)
+        return model_registry.preload(loaders, background=background)
+
+    @property
+    def index_version(self) -> str:
+        """Identifies the model(s) producing the stored vectors."""
+        version = self.embedding_handler.model_version
+        if self.sparse_embedding_handler is not None:
+            version += f"+{self.sparse_embedding_handler.model_name}"
+        return version
+
+    @property
+    def is_local_client(self) -> bool:
+        """True for an in-process client (``:memory:`` or a local path)."""
+        options = self.client.init_options if self.client else {}
+        return options.get("location") == ":memory:" or bool(options.get("path"))
+
+    def embed_points(self, points: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Return copies of ``points`` with the vectors of ``payload["text"]``.
+
+        Sets ``vector`` and, for hybrid collections, ``sparse_vector``.
+        """
+        texts = [point["payload"]["text"] for point in points]
+        vectors = self.embedding_handler.embed_documents(texts)
+        embedded = [
+            {**point, "vector": vector} for point, vector in zip(points, vectors)
+        ]
+        if self.sparse_embedding_handler is not None:
+            sparse_vectors = self.sparse_embedding_handler.embed_documents(texts)
+            for point, sparse_vector in zip(embedded, sparse_vectors):
+                point["sparse_vector"] = sparse_vector
+        return embedded
+
+    def _dense_query(
+        self, query_vector: Union[np.ndarray, List[float]]
+    ) -> Union[List[float], NamedVector]:
+        vector = to_qdrant_vector(query_vector)
+        if self.dense_vector_name:
+            return NamedVector(name=self.dense_vector_name, vector=vector)
+        return vector
+
     def connect_to_database(self) -> bool:
         """Establish connection to Qdrant database.
 
         Returns:
             bool: True if connection successful, False otherwise
         """
+        if self.client:
+            return True
         try:
-            self.client = QClient(
+            # Shared per connection settings; gRPC avoids JSON (de)serialising
+            # vectors and keeps one multiplexed channel per process.
+            self._client_key, self.client = qdrant_client_pool.acquire(
                 url=app_config.QDRANT_URL,
                 api_key=app_config.QDRANT_API_KEY,
-                prefer_grpc=False,
+                prefer_grpc=bool(app_config.QDRANT_PREFER_GRPC),
+                grpc_port=app_config.QDRANT_GRPC_PORT or 6334,
+                timeout=app_config.QDRANT_TIMEOUT or 10,
             )
             logging.info("✅ Qdrant connection established")
             return True
@@ -59,11 +359,30 @@ class QdrantDBClient:
             self.client = None
             return False
 
-    def create_collection(self, collection_name: Optional[str] = None) -> bool:
+    def create_collection(
+        self,
+        collection_name: Optional[str] = None,
+        payload_indexes: Optional[Dict[str, PayloadSchemaType]] = None,
+        quantization: Optional[str] = None,
+        on_disk: Optional[bool] = None,
+        hnsw_m: Optional[int] = None,
+        hnsw_ef_construct: Optional[int] = None,
+    ) -> bool:
         """Create a new collection in Qdrant.
 
+        Storage options default to the QDRANT_QUANTIZATION, QDRANT_ON_DISK,
+        QDRANT_HNSW_M and QDRANT_HNSW_EF_CONSTRUCT settings.
+
         Args:
             collection_name (Optional[str]): Name of collection to create
+            payload_indexes (Optional[Dict[str, PayloadSchemaType]]): Payload
+                fields to index; defaults to ``self.payload_indexes``
+            quantization (Optional[str]): ``"scalar"`` (int8, ~4x smaller),
+                ``"binary"`` (1 bit, ~32x smaller) or None for float32 only
+            on_disk (Optional[bool]): Keep original vectors on disk (memory
+                mapped); pairs with quantization to cut RAM
+            hnsw_m (Optional[int]): HNSW graph degree
+            hnsw_ef_construct (Optional[int]): HNSW build-time beam size
 
         Returns:
             bool: True if creation successful, False otherwise
@@ -74,18 +393,81 @@ class QdrantDBClient:
 
         try:
             collection = collection_name or self.collection_name
+            quantization = quantization or app_config.QDRANT_QUANTIZATION
+            on_disk = on_disk if on_disk is not None else app_config.QDRANT_ON_DISK
+            hnsw_m = hnsw_m or app_config.QDRANT_HNSW_M
+            hnsw_ef_construct = hnsw_ef_construct or app_config.QDRANT_HNSW_EF_CONSTRUCT
+            hnsw_config = None
+            if hnsw_m or hnsw_ef_construct:
+                hnsw_config = HnswConfigDiff(m=hnsw_m, ef_construct=hnsw_ef_construct)
+            vectors_config = VectorParams(
+                size=self.vector_size,
+                distance=Distance.COSINE,
+                on_disk=on_disk,
+            )
+            sparse_vectors_config = None
+            if self.hybrid:
+                vectors_config = {self.dense_vector_name: vectors_config}
+                sparse_vectors_config = {
+                    SPARSE_VECTOR_NAME: SparseVectorParams(
+                        modifier=(
+                            Modifier.IDF
+                            if self.sparse_embedding_handler.requires_idf
+                            else None
+                        )
+                    )
+                }
             self.client.create_collection(
                 collection_name=collection,
-                vectors_config=VectorParams(
-                    size=self.vector_size, distance=Distance.COSINE
-                ),
+                vectors_config=vectors_config,
+                sparse_vectors_config=sparse_vectors_config,
+                hnsw_config=hnsw_config,
+                quantization_config=build_quantization_config(quantization),
             )
             logging.info(f"✅ Collection '{collection}' created successfully")
-            return True
+            return self.create_payload_indexes(collection, payload_indexes)
         except Exception as e:
             logging.error(f"❌ Error creating collection: {e}")
             return False
 
+    def create_payload_indexes(
+        self,
+        collection_name: Optional[str] = None,
+        payload_indexes: Optional[Dict[str, PayloadSchemaType]] = None,
+    ) -> bool:
+        """Index payload fields so filtered searches are indexed lookups.
+
+        Safe to call on an existing collection; already indexed fields are
+        left as they are.
+
+        Args:
+            collection_name (Optional[str]): Target collection name
+            payload_indexes (Optional[Dict[str, PayloadSchemaType]]): Field
+                name to schema type; defaults to ``self.payload_indexes``
+
+        Returns:
+            bool: True if every index was created, False otherwise
+        """
+        if not self.client:
+            logging.error("❌ No Qdrant connection")
+            return False
+
+        collection = collection_name or self.collection_name
+        fields = self.payload_indexes if payload_indexes is None else payload_indexes
+        try:
+            for field_name, field_schema in fields.items():
+                self.client.create_payload_index(
+                    collection_name=collection,
+                    field_name=field_name,
+                    field_schema=field_schema,
+                    wait=True,
+                )
+            logging.info(f"✅ Payload indexes ready on '{collection}': {list(fields)}")
+            return True
+        except Exception as e:
+            logging.error(f"❌ Error creating payload indexes: {e}")
+            return False
+
     def insert_vectors(
         self, points: List[Dict[str, Any]], collection_name: Optional[str] = None
     ) -> bool:
@@ -104,27 +486,93 @@ class QdrantDBClient:
 
         try:
             collection = collection_name or self.collection_name
-            self.client.upsert(collection_name=collection, points=points)
+            retry_with_backoff(
+                self.client.upsert,
+                collection_name=collection,
+                points=[
+                    to_point_struct(point, self.dense_vector_name) for point in points
+                ],
+                max_retries=self.max_retries,
+            )
             logging.info(f"✅ Successfully inserted {len(points)} vectors")
             return True
         except Exception as e:
             logging.error(f"❌ Error inserting vectors: {e}")
             return False
 
+    def upload_points(
+        self,
+        points: List[Dict[str, Any]],
+        collection_name: Optional[str] = None,
+        batch_size: int = 256,
+        parallel: int = 1,
+    ) -> bool:
+        """Upload embedded points with the client's batched uploader.
+
+        Args:
+            points (List[Dict[str, Any]]): Points with ``id``, ``vector`` and ``payload``
+            collection_name (Optional[str]): Target collection name
+            batch_size (int): Points per upload request
+            parallel (int): Number of parallel upload processes
+
+        Returns:
+            bool: True if upload successful, False otherwise
+        """
+        if not self.client:
+            logging.error("❌ No Qdrant connection")
+            return False
+
+        try:
+            collection = collection_name or self.collection_name
+            self.client.upload_points(
+                collection_name=collection,
+                points=[
+                    to_point_struct(point, self.dense_vector_name) for point in points
+                ],
+                batch_size=batch_size,
+                parallel=parallel,
+                max_retries=self.max_retries,
+                wait=True,
+            )
+            logging.info(f"✅ Successfully uploaded {len(points)} vectors")
+            return True
+        except Exception as e:
+            logging.error(f"❌ Error uploading vectors: {e}")
+            return False
+
     def search_vectors(
         self,
-        query_vector: List[float],
+        query_vector: Union[np.ndarray, List[float]],
         limit: int = 10,
         collection_name: Optional[str] = None,
         score_threshold: Optional[float] = None,
+        must: Optional[Dict[str, Any]] = None,
+        should: Optional[Dict[str, Any]] = None,
+        must_not: Optional[Dict[str, Any]] = None,
+        hnsw_ef: Optional[int] = None,
+        exact: bool = False,
+        oversampling: Optional[float] = None,
+        rescore: Optional[bool] = None,
     ) -> List[Dict[str, Any]]:
         """Search for similar vectors in collection.
 
         Args:
-            query_vector (List[float]): Vector to search for
+            query_vector (Union[np.ndarray, List[float]]): Vector to search for
             limit (int): Maximum number of results
             collection_name (Optional[str]): Target collection name
             score_threshold (Optional[float]): Minimum similarity score
+            must (Optional[Dict[str, Any]]): Payload conditions that must all hold
+            should (Optional[Dict[str, Any]]): Payload conditions of which at
+                least one must hold
+            must_not (Optional[Dict[str, Any]]): Payload conditions that must
+                not hold
+            hnsw_ef (Optional[int]): HNSW search beam size; higher is more
+                accurate and slower
+            exact (bool): Bypass the HNSW index and search exhaustively
+            oversampling (Optional[float]): Quantized collections: fetch
+                ``limit * oversampling`` candidates before rescoring
+            rescore (Optional[bool]): Quantized collections: re-rank the
+                candidates with the original vectors
 
         Returns:
             List[Dict[str, Any]]: Search results
@@ -139,10 +587,16 @@ class QdrantDBClient:
             if score_threshold is not None:
                 search_params["score_threshold"] = score_threshold
 
-            results = self.client.search(
+            results = retry_with_backoff(
+                self.client.search,
                 collection_name=collection,
-                query_vector=query_vector,
+                query_vector=self._dense_query(query_vector),
+                query_filter=build_payload_filter(must, should, must_not),
+                search_params=build_search_params(
+                    hnsw_ef, exact, oversampling or self.oversampling, rescore
+                ),
                 limit=limit,
+                max_retries=self.max_retries,
                 **search_params,
             )
 
@@ -155,6 +609,184 @@ class QdrantDBClient:
             logging.error(f"❌ Error searching vectors: {e}")
             return []
 
+    def search_vectors_batch(
+        self,
+        query_vectors: Union[np.ndarray, List[List[float]]],
+        limit: int = 10,
+        collection_name: Optional[str] = None,
+        score_threshold: Optional[float] = None,
+        must: Optional[Dict[str, Any]] = None,
+        should: Optional[Dict[str, Any]] = None,
+        must_not: Optional[Dict[str, Any]] = None,
+        hnsw_ef: Optional[int] = None,
+        exact: bool = False,
+        oversampling: Optional[float] = None,
+        rescore: Optional[bool] = None,
+    ) -> List[List[Dict[str, Any]]]:
+        """Search several query vectors in a single request.
+
+        Batching only saves network round trips: a single query, or an
+        in-process client (``:memory:`` / local path) whose search_batch
+        runs the same searches one by one, goes through search_vectors.
+
+        Args:
+            query_vectors (Union[np.ndarray, List[List[float]]]): Vectors to search for
+            limit (int): Maximum number of results per query
+            collection_name (Optional[str]): Target collection name
+            score_threshold (Optional[float]): Minimum similarity score
+            must, should, must_not (Optional[Dict[str, Any]]): Payload filter
+                applied to every query (see ``search_vectors``)
+            hnsw_ef (Optional[int]): HNSW search beam size
+            exact (bool): Bypass the HNSW index and search exhaustively
+            oversampling (Optional[float]): Quantized candidate oversampling
+            rescore (Optional[bool]): Rescore candidates with original vectors
+
+        Returns:
+            List[List[Dict[str, Any]]]: Search results for each query, in order
+        """
+        if not self.client:
+            logging.error("❌ No Qdrant connection")
+            return [[] for _ in query_vectors]
+
+        if len(query_vectors) == 1 or self.is_local_client:
+            return [
+                self.search_vectors(
+                    query_vector,
+                    limit=limit,
+                    collection_name=collection_name,
+                    score_threshold=score_threshold,
+                    must=must,
+                    should=should,
+                    must_not=must_not,
+                    hnsw_ef=hnsw_ef,
+                    exact=exact,
+                    oversampling=oversampling,
+                    rescore=rescore,
+                )
+                for query_vector in query_vectors
+            ]
+
+        try:
+            collection = collection_name or self.collection_name
+            query_filter = build_payload_filter(must, should, must_not)
+            params = build_search_params(
+                hnsw_ef, exact, oversampling or self.oversampling, rescore
+            )
+            requests = [
+                SearchRequest(
+                    vector=self._dense_query(query_vector),
+                    filter=query_filter,
+                    params=params,
+                    limit=limit,
+                    score_threshold=score_threshold,
+                    with_payload=True,
+                )
+                for query_vector in query_vectors
+            ]
+            if not requests:
+                return []
+
+            batch_results = retry_with_backoff(
+                self.client.search_batch,
+                collection_name=collection,
+                requests=requests,
+                max_retries=self.max_retries,
+            )
+
+            return [
+                [
+                    {"id": result.id, "score": result.score, "payload": result.payload}
+                    for result in results
+                ]
+                for results in batch_results
+            ]
+
+        except Exception as e:
+            logging.error(f"❌ Error batch searching vectors: {e}")
+            return [[] for _ in query_vectors]
+
+    def search_hybrid_batch(
+        self,
+        query_vectors: Union[np.ndarray, List[List[float]]],
+        sparse_vectors: List[SparseVector],
+        limit: int = 10,
+        collection_name: Optional[str] = None,
+        prefetch_limit: Optional[int] = None,
+        must: Optional[Dict[str, Any]] = None,
+        should: Optional[Dict[str, Any]] = None,
+        must_not: Optional[Dict[str, Any]] = None,
+    ) -> List[List[Dict[str, Any]]]:
+        """Dense + sparse search fused with Reciprocal Rank Fusion.
+
+        For each query, the dense and sparse indexes each return
+        ``prefetch_limit`` candidates, which Qdrant fuses by rank (RRF) into
+        the top ``limit``. All queries go in a single request. Scores are
+        RRF scores, not similarities.
+
+        Args:
+            query_vectors (Union[np.ndarray, List[List[float]]]): Dense query vectors
+            sparse_vectors (List[SparseVector]): Sparse query vectors, same order
+            limit (int): Maximum number of fused results per query
+            collection_name (Optional[str]): Target collection name
+            prefetch_limit (Optional[int]): Candidates per index; 4 * limit if None
+            must, should, must_not (Optional[Dict[str, Any]]): Payload filter
+                applied to both indexes
+
+        Returns:
+            List[List[Dict[str, Any]]]: Search results for each query, in order
+        """
+        if not self.client:
+            logging.error("❌ No Qdrant connection")
+            return [[] for _ in query_vectors]
+        if len(query_vectors) == 0:
+            return []
+
+        try:
+            collection = collection_name or self.collection_name
+            query_filter = build_payload_filter(must, should, must_not)
+            prefetch_limit = prefetch_limit or limit * 4
+            requests = [
+                QueryRequest(
+                    prefetch=[
+                        Prefetch(
+                            query=to_qdrant_vector(query_vector),
+                            using=DENSE_VECTOR_NAME,
+                            filter=query_filter,
+                            limit=prefetch_limit,
+                        ),
+                        Prefetch(
+                            query=sparse_vector,
+                            using=SPARSE_VECTOR_NAME,
+                            filter=query_filter,
+                            limit=prefetch_limit,
+                        ),
+                    ],
+                    query=FusionQuery(fusion=Fusion.RRF),
+                    limit=limit,
+                    with_payload=True,
+                )
+                for query_vector, sparse_vector in zip(query_vectors, sparse_vectors)
+            ]
+
+            batch_results = retry_with_backoff(
+                self.client.query_batch_points,
+                collection_name=collection,
+                requests=requests,
+                max_retries=self.max_retries,
+            )
+
+            return [
+                [
+                    {"id": point.id, "score": point.score, "payload": point.payload}
+                    for point in response.points
+                ]
+                for response in batch_results
+            ]
+
+        except Exception as e:
+            logging.error(f"❌ Error in hybrid search: {e}")
+            return [[] for _ in query_vectors]
+
     def delete_vectors(
         self, point_ids: List[int], collection_name: Optional[str] = None
     ) -> bool:
@@ -173,9 +805,11 @@ class QdrantDBClient:
 
         try:
             collection = collection_name or self.collection_name
-            self.client.delete(
+            retry_with_backoff(
+                self.client.delete,
                 collection_name=collection,
                 points_selector=PointIdsList(points=point_ids),
+                max_retries=self.max_retries,
             )
             logging.info(f"✅ Successfully deleted {len(point_ids)} vectors")
             return True
@@ -190,13 +824,7 @@ class QdrantDBClient:
         pdf_path = os.path.join("./data/input_brochure", pdf_name)
         # import pdb; pdb.set_trace()
         object_key = f"uploads/{today}/{pdf_name}"
-        s3 = boto3.client(
-            "s3",
-            aws_access_key_id=app_config.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=app_config.AWS_SECRET_ACCESS_KEY,
-            region_name=app_config.AWS_REGION,
-        )
-        s3.upload_file(
+        get_s3_client().upload_file(
             pdf_path,
             app_config.AWS_BUCKET_NAME,
             object_key,
@@ -222,10 +850,13 @@ class QdrantDBClient:
         try:
             collection = collection_name or self.collection_name
             info = self.client.get_collection(collection_name=collection)
+            vectors_config = info.config.params.vectors
+            if isinstance(vectors_config, dict):
+                vectors_config = vectors_config[DENSE_VECTOR_NAME]
             return {
-                "name": info.name,
-                "vector_size": info.vectors_config.size,
-                "distance": info.vectors_config.distance,
+                "name": collection,
+                "vector_size": vectors_config.size,
+                "distance": vectors_config.distance,
                 "points_count": info.points_count,
             }
         except Exception as e:
@@ -250,28 +881,64 @@ class QdrantDBClient:
         Returns:
             bool: True if save successful, False otherwise
         """
-        vector = self.embedding_handler.get_embedding(text)
         return self.insert_vectors(
-            [{"id": id, "vector": vector, "payload": {"text": text, **metadata}}],
+            self.embed_points([{"id": id, "payload": {"text": text, **metadata}}]),
             collection_name,
         )
 
-    def search_similar_texts(self, query: str, limit: int = 7) -> List[Dict[str, Any]]:
+    def search_similar_texts(
+        self,
+        query: str,
+        limit: int = 7,
+        topk: int = 6,
+        score_threshold: Optional[float] = None,
+        must: Optional[Dict[str, Any]] = None,
+        should: Optional[Dict[str, Any]] = None,
+        must_not: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
         """Search for similar texts and rerank results.
 
         Args:
             query (str): Search query
-            limit (int): Maximum number of results
+            limit (int): Maximum number of candidates passed to the reranker
+            topk (int): Number of top results to keep after reranking
+            score_threshold (Optional[float]): Minimum vector similarity score;
+                ignored for hybrid collections, whose scores are rank based
+            must, should, must_not (Optional[Dict[str, Any]]): Payload filter,
+                e.g. ``must={"filename": "brochure.md"}``
 
         Returns:
             List[Dict[str, Any]]: Reranked search results
         """
-        query_vector = self.embedding_handler.get_embedding(query)
-        results = self.search_vectors(query_vector=query_vector, limit=limit)
-        return self.search_handler.search_and_rerank(query, results)
+        query_vector = self.embedding_handler.embed_query(query)
+        if self.hybrid:
+            results = self.search_hybrid_batch(
+                [query_vector],
+                [self.sparse_embedding_handler.embed_query(query)],
+                limit=limit,
+                must=must,
+                should=should,
+                must_not=must_not,
+            )[0]
+            return self.search_handler.search_and_rerank(query, results, topk)
+        results = self.search_vectors(
+            query_vector=query_vector,
+            limit=limit,
+            score_threshold=score_threshold,
+            must=must,
+            should=should,
+            must_not=must_not,
+        )
+        return self.search_handler.search_and_rerank(query, results, topk)
 
     def batch_search_similar_texts(
-        self, query_list: List[str], limit: int = 5, topk: int = 3
+        self,
+        query_list: List[str],
+        limit: int = 5,
+        topk: int = 3,
+        must: Optional[Dict[str, Any]] = None,
+        should: Optional[Dict[str, Any]] = None,
+        must_not: Optional[Dict[str, Any]] = None,
     ) -> List[List[Dict[str, Any]]]:
         """Batch search for similar texts and rerank results.
 
@@ -279,25 +946,41 @@ class QdrantDBClient:
             query_list (List[str]): List of search queries
             limit (int): Maximum number of results per query
             topk (int): Number of top results to keep after reranking
+            must, should, must_not (Optional[Dict[str, Any]]): Payload filter
+                applied to every query
 
         Returns:
             List[List[Dict[str, Any]]]: Reranked search results for each query
         """
-        query_vectors = self.embedding_handler.get_batch_embeddings(query_list)
-        batch_results = []
-
-        for query_vector in query_vectors:
-            results = self.search_vectors(query_vector=query_vector, limit=limit)
-            batch_results.append(results)
-
+        query_vectors = self.embedding_handler.embed_queries(query_list)
+        if self.hybrid:
+            batch_results = self.search_hybrid_batch(
+                query_vectors,
+                self.sparse_embedding_handler.embed_queries(query_list),
+                limit=limit,
+                must=must,
+                should=should,
+                must_not=must_not,
+            )
+        else:
+            batch_results = self.search_vectors_batch(
+                query_vectors, limit=limit, must=must, should=should, must_not=must_not
+            )
         return self.search_handler.batch_search_and_rerank(
             query_list, batch_results, topk
         )
 
     def close_connection(self):
-        """Close the connection to Qdrant."""
+        """Release the connection to Qdrant.
+
+        Pooled clients are only closed once no other handler uses them.
+        """
         if self.client:
-            self.client.close()
+            if self._client_key is not None:
+                qdrant_client_pool.release(self._client_key)
+                self._client_key = None
+            else:
+                self.client.close()
             self.client = None
             logging.info("🔒 Qdrant connection closed")
         else:
@@ -307,11 +990,100 @@ class QdrantDBClient:
         """Destructor to ensure connection is closed."""
         self.close_connection()
 
+    def read_markdown_document(
+        self, directory_path: str, filename: str
+    ) -> Optional[Dict[str, Any]]:
+        """Read one markdown file and upload its source PDF to S3.
+
+        Args:
+            directory_path (str): Directory containing the file
+            filename (str): Markdown file name
+
+        Returns:
+            Optional[Dict[str, Any]]: ``filename``, ``file_path`` (S3 URL) and
+            ``content``, or None for non-markdown or empty files
+        """
+        if not filename.endswith(".md"):
+            print("Skipping file: ", filename)
+            return None
+        filename_url = self.upload_pdf_file_to_s3(filename)
+        print("Embedding file: ", filename)
+        print("File name url: ", filename_url)
+        file_path = os.path.join(directory_path, filename)
+        content = self.document_parser.read_markdown_file(file_path)
+        if not content:
+            return None
+        return {"filename": filename, "file_path": filename_url, "content": content}
+
+    def chunk_markdown_document(
+        self,
+        document: Dict[str, Any],
+        chunk_size: int = 1024,
+        chunk_overlap: int = 100,
+        source_type: str = "pdf",
+    ) -> List[Dict[str, Any]]:
+        """Split a document from read_markdown_document into un-embedded points.
+
+        Args:
+            document (Dict[str, Any]): Document returned by read_markdown_document
+            chunk_size (int): Maximum size of each text chunk
+            chunk_overlap (int): Overlap between consecutive chunks
+            source_type (str): Value stored in the ``source_type`` payload field
+
+        Returns:
+            List[Dict[str, Any]]: Points with ``vector`` set to None
+        """
+        filename = document["filename"]
+        chunks = self.chunker.chunk_text(
+            document["content"], chunk_size=chunk_size, chunk_overlap=chunk_overlap
+        )
+        return [
+            {
+                "id": self.generate_doc_id(f"{filename}_chunk_{i}"),
+                "vector": None,
+                "payload": {
+                    "text": chunk,
+                    "filename": filename,
+                    "file_path": document["file_path"],
+                    "source_type": source_type,
+                    "chunk_index": i,
+                    "total_chunks": len(chunks),
+                },
+            }
+            for i, chunk in enumerate(chunks)
+        ]
+
+    def iter_markdown_directory_points(
+        self, directory_path: str, chunk_size: int = 1024, chunk_overlap: int = 100
+    ) -> Iterator[Dict[str, Any]]:
+        """Lazily yield chunk points for the markdown files of a directory.
+
+        Only one file's chunks are held in memory at a time.
+
+        Args:
+            directory_path (str): Path to directory containing markdown files
+            chunk_size (int): Maximum size of each text chunk
+            chunk_overlap (int): Overlap between consecutive chunks
+
+        Yields:
+            Dict[str, Any]: Points ready for embedding
+        """
+        for filename in sorted(os.listdir(directory_path)):
+            document = self.read_markdown_document(directory_path, filename)
+            if document is None:
+                continue
+            yield from self.chunk_markdown_document(
+                document, chunk_size=chunk_size, chunk_overlap=chunk_overlap
+            )
+
     def read_markdown_file_in_a_directory_convert_to_point(
-        self, directory_path: str, chunk_size: int = 5000, chunk_overlap: int = 200
+        self, directory_path: str, chunk_size: int = 1024, chunk_overlap: int = 100
     ) -> List[Dict]:
         """Read markdown files from a directory and convert to points with chunking.
 
+        Prefer iter_markdown_directory_points or insert_markdown_directory for
+        large corpora; this materialises every point.
+
         Args:
             directory_path (str): Path to directory containing markdown files
             chunk_size (int): Maximum size of each text chunk
@@ -320,80 +1092,215 @@ class QdrantDBClient:
         Returns:
             List[Dict]: List of points ready for vector database insertion
         """
-        points = []
-        for filename in os.listdir(directory_path):
-            if not filename.endswith(".md"):
-                print("Skipping file: ", filename)
-                continue
-            filename_url = self.upload_pdf_file_to_s3(filename)
-            print("Embedding file: ", filename)
-            print("File name url: ", filename_url)
-            # import pdb; pdb.set_trace()
-            if filename.endswith(".md"):
-                file_path = os.path.join(directory_path, filename)
-                content = self.document_parser.read_markdown_file(file_path)
-                if not content:
-                    continue
-                chunks = self.chunker.chunk_text(
-                    content, chunk_size=1024, chunk_overlap=100
-                )
-                for i, chunk in enumerate(chunks):
-                    print(chunk)
-                    print("--------------------------------")
-                    chunk_id = self.generate_doc_id(f"{filename}_chunk_{i}")
-                    points.append(
-                        {
-                            "id": chunk_id,
-                            "vector": None,
-                            "payload": {
-                                "text": chunk,
-                                "filename": filename,
-                                "file_path": filename_url,
-                                "source_type": "pdf",
-                                "chunk_index": i,
-                                "total_chunks": len(chunks),
-                            },
-                        }
-                    )
-            # import pdb; pdb.set_trace()
-        return points
+        return list(
+            self.iter_markdown_directory_points(
+                directory_path, chunk_size=chunk_size, chunk_overlap=chunk_overlap
+            )
+        )
 
     def insert_markdown_directory(
-        self, directory_path: str, collection_name: Optional[str] = None
+        self,
+        directory_path: str,
+        collection_name: Optional[str] = None,
+        embed_batch_size: int = 64,
+        upsert_batch_size: int = 256,
+        parallel: int = 2,
+        incremental: bool = True,
+        manifest_path: Optional[str] = None,
     ) -> bool:
+        """Stream a markdown directory through the ingestion pipeline.
+
+        Files are read, chunked, embedded and upserted by separate worker
+        stages connected with bounded queues (see IngestionPipeline), so peak
+        memory does not grow with the corpus.
+
+        Args:
+            directory_path (str): Directory containing markdown files
+            collection_name (Optional[str]): Target collection name
+            embed_batch_size (int): Texts per embedding call
+            upsert_batch_size (int): Points per upsert request
+            parallel (int): Upload-stage threads, each sending one batch at
+                a time with upload_points
+            incremental (bool): Skip unchanged files/chunks and delete removed
+                ones using an ingestion manifest
+            manifest_path (Optional[str]): Manifest location; defaults to
+                ``.ingestion_manifest.json`` inside the directory
+
+        Returns:
+            bool: True if every chunk was inserted, False otherwise
+        """
         try:
-            points = self.read_markdown_file_in_a_directory_convert_to_point(
-                directory_path
+            manifest = None
+            if incremental:
+                manifest = IngestionManifest(
+                    manifest_path
+                    or os.path.join(directory_path, ".ingestion_manifest.json"),
+                    collection=collection_name or self.collection_name,
+                    embedding_model=self.index_version,
+                )
+            pipeline = IngestionPipeline(
+                self,
+                embed_batch_size=embed_batch_size,
+                upsert_batch_size=upsert_batch_size,
+                upload_workers=parallel,
             )
-            success = True
-            for point in points:
-                if not self.save_text_to_qdrant(
-                    id=point["id"],
-                    text=point["payload"]["text"],
-                    metadata={
-                        "filename": point["payload"]["filename"],
-                        "file_path": point["payload"]["file_path"],
-                        "source_type": "markdown",
-                    },
-                    collection_name=collection_name,
-                ):
-                    success = False
-                else:
-                    print(
-                        f"Successfully inserted document: {point['payload']['filename']}"
-                    )
-            return success
+            stats = pipeline.run(
+                directory_path, collection_name=collection_name, manifest=manifest
+            )
+            self.last_ingestion_stats = stats
+            logging.info(
+                f"✅ Ingested {stats['inserted']}/{stats['points']} chunks "
+                f"from {stats['files']} files in {stats['seconds']:.2f}s, "
+                f"skipped {stats['skipped_files']} unchanged files and "
+                f"{stats['skipped_chunks']} unchanged chunks, "
+                f"deleted {stats['deleted_points']} stale points "
+                f"(embed {stats['embed_seconds']:.2f}s, "
+                f"upsert {stats['upsert_seconds']:.2f}s, "
+                f"{stats['chunks_per_second']:.1f} chunks/s)"
+            )
+            return stats["failed"] == 0 and stats["errors"] == 0
         except Exception as e:
             logging.error(f"Error processing markdown directory: {e}")
             return False
 
     def generate_doc_id(self, filename: str, row_index: Optional[int] = None) -> int:
-        """Generate a document ID from filename hash."""
-        identifier = filename
-        if row_index is not None:
-            identifier += f"_row_{row_index}"
-        hash_object = hashlib.md5(identifier.encode())
-        return int(hash_object.hexdigest(), 16) % 1000000
+        """Generate a 64-bit document ID from filename hash."""
+        return DocumentParser.generate_doc_id(filename, row_index)
+
+    def rekey_collection(
+        self, collection_name: Optional[str] = None, batch_size: int = 256
+    ) -> Dict[str, int]:
+        """Move points of a collection to the current 64-bit ID scheme.
+
+        New IDs are derived from the payload and the current ID (see
+        ``point_identifier``), so they match what re-ingesting the same
+        content would produce. Points whose identifier cannot be derived
+        keep their ID. A point already present under its new ID with the
+        same payload was moved by an interrupted run; only its old ID is
+        deleted, so the migration can be resumed. If two points would get
+        the same new ID, or a new ID holds a different point, nothing is
+        moved.
+
+        Args:
+            collection_name (Optional[str]): Collection to migrate
+            batch_size (int): Points per scroll/retrieve/upsert request
+
+        Returns:
+            Dict[str, int]: Counts of scanned, moved, resumed (old copy of an
+            already moved point deleted), unchanged, unresolved (no
+            derivable identifier) and conflicting points
+        """
+        collection = collection_name or self.collection_name
+        stats = {
+            "scanned": 0,
+            "moved": 0,
+            "resumed": 0,
+            "unchanged": 0,
+            "unresolved": 0,
+            "conflicts": 0,
+        }
+        if not self.client:
+            logging.error("❌ No Qdrant connection")
+            return stats
+
+        # Collect the whole mapping first so re-keyed points are never
+        # scrolled over a second time.
+        mapping: Dict[Any, int] = {}
+        digests: Dict[Any, str] = {}
+        legacy_chunks: Dict[str, Dict[int, List[int]]] = {}
+        offset = None
+        while True:
+            records, offset = self.client.scroll(
+                collection_name=collection,
+                limit=batch_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=False,
+            )
+            for record in records:
+                stats["scanned"] += 1
+                digests[record.id] = payload_digest(record.payload)
+                identifier = point_identifier(
+                    record.payload or {}, record.id, legacy_chunks
+                )
+                if identifier is None:
+                    stats["unresolved"] += 1
+                    continue
+                new_id = hash_point_id(identifier)
+                if new_id == record.id:
+                    stats["unchanged"] += 1
+                else:
+                    mapping[record.id] = new_id
+            if offset is None:
+                break
+
+        # A target holding the same payload is this point, copied by an
+        # interrupted run: only the old ID is left to delete.
+        resumed = [
+            old_id
+            for old_id, new_id in mapping.items()
+            if digests.get(new_id) == digests[old_id]
+        ]
+        for old_id in resumed:
+            del mapping[old_id]
+
+        # Refuse many-to-one moves and moves onto other points: the upsert
+        # would silently overwrite them.
+        targets: Dict[int, int] = {}
+        for new_id in mapping.values():
+            targets[new_id] = targets.get(new_id, 0) + 1
+        conflicts = [
+            old_id
+            for old_id, new_id in mapping.items()
+            if targets[new_id] > 1 or new_id in digests
+        ]
+        if conflicts:
+            stats["conflicts"] = len(conflicts)
+            logging.error(
+                f"❌ Re-key aborted: {len(conflicts)} points of '{collection}' map "
+                f"to an ID that is shared or already taken, e.g. {conflicts[:5]}"
+            )
+            return stats
+
+        for i in range(0, len(resumed), batch_size):
+            self.client.delete(
+                collection_name=collection,
+                points_selector=PointIdsList(points=resumed[i : i + batch_size]),
+                wait=True,
+            )
+        stats["resumed"] = len(resumed)
+
+        old_ids = list(mapping)
+        for i in range(0, len(old_ids), batch_size):
+            batch_ids = old_ids[i : i + batch_size]
+            records = self.client.retrieve(
+                collection_name=collection,
+                ids=batch_ids,
+                with_payload=True,
+                with_vectors=True,
+            )
+            self.client.upsert(
+                collection_name=collection,
+                points=[
+                    PointStruct(
+                        id=mapping[record.id],
+                        vector=record.vector,
+                        payload=record.payload,
+                    )
+                    for record in records
+                ],
+                wait=True,
+            )
+            self.client.delete(
+                collection_name=collection,
+                points_selector=PointIdsList(points=[r.id for r in records]),
+                wait=True,
+            )
+            stats["moved"] += len(records)
+            logging.info(f"🔑 Re-keyed {stats['moved']}/{len(old_ids)} points")
+
+        logging.info(f"✅ Re-keyed collection '{collection}': {stats}")
+        return stats
 
     def delete_collection(self, collection_name: Optional[str] = None) -> bool:
         """Delete a collection from Qdrant."""
@@ -407,3 +1314,21 @@ class QdrantDBClient:
         except Exception as e:
             logging.error(f"❌ Error deleting collection: {e}")
             return False
+
+
+if __name__ == "__main__":
+    import sys
+
+    logging.basicConfig(level=logging.INFO)
+    if len(sys.argv) != 3 or sys.argv[1] != "rekey":
+        print(
+            "Usage: python -m src.database_handler.qdrant_connector rekey <collection>"
+        )
+        sys.exit(1)
+    qdrant = QdrantDBClient(sys.argv[2])
+    if not qdrant.connect_to_database():
+        sys.exit(1)
+    rekey_stats = qdrant.rekey_collection()
+    print(rekey_stats)
+    qdrant.close_connection()
+    sys.exit(1 if rekey_stats["conflicts"] else 0)
@@ -1,20 +1,66 @@
 import logging
-from typing import Any, Dict, List
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
 
 from flashrank import Ranker, RerankRequest
 
 from .embedding_handler import EmbeddingHandler
+from .model_registry import model_registry
 
 
 class SearchHandler:
-    def __init__(self, embedding_handler: EmbeddingHandler):
+    def __init__(
+        self,
+        embedding_handler: EmbeddingHandler,
+        max_length: int = 512,
+        max_passage_chars: Optional[int] = None,
+        rerank_workers: int = 4,
+    ):
         """Initialize search handler with embedding handler and reranker.
 
         Args:
             embedding_handler (EmbeddingHandler): Handler for generating embeddings
+            max_length (int): Reranker token limit per (query, passage) pair
+            max_passage_chars (Optional[int]): Cut passages to this many
+                characters before tokenizing; 8 * max_length if None
+            rerank_workers (int): Threads reranking different queries of a
+                batch concurrently
         """
         self.embedding_handler = embedding_handler
-        self.reranker = Ranker(model_name="rank-T5-flan", cache_dir="./models")
+        self.reranker_model_name = "rank-T5-flan"
+        self.max_length = max_length
+        # Tokens past max_length are dropped anyway; cutting the text first
+        # avoids tokenizing whole long chunks.
+        self.max_passage_chars = max_passage_chars or max_length * 8
+        self.rerank_workers = rerank_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    @property
+    def reranker(self) -> Ranker:
+        return model_registry.get_or_load(
+            f"flashrank/{self.reranker_model_name}@{self.max_length}",
+            lambda: Ranker(
+                model_name=self.reranker_model_name,
+                cache_dir="./models",
+                max_length=self.max_length,
+            ),
+        )
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.rerank_workers, thread_name_prefix="rerank"
+                    )
+        return self._executor
+
+    def load_model(self) -> None:
+        """Load the reranker now instead of on the first request."""
+        self.reranker
 
     def search_and_rerank(
         self, query: str, search_results: List[Dict[str, Any]], topk: int = 6
@@ -35,11 +81,12 @@ class SearchHandler:
         passages = [
             {
                 "id": str(doc["id"]),
-                "text": doc["payload"]["text"],
+                "text": doc["payload"]["text"][: self.max_passage_chars],
                 "meta": {k: v for k, v in doc["payload"].items() if k != "text"},
             }
             for doc in search_results
         ]
+        full_texts = {str(doc["id"]): doc["payload"]["text"] for doc in search_results}
 
         rerank_request = RerankRequest(query=query, passages=passages)
         reranked = self.reranker.rerank(rerank_request)
@@ -49,7 +96,7 @@ class SearchHandler:
             {
                 "score": item.get("score"),
                 "id": item.get("id"),
-                "text": item.get("text"),
+                "text": full_texts.get(item.get("id"), item.get("text")),
                 "payload": item.get("meta", {}),
             }
             for item in reranked
@@ -63,6 +110,10 @@ class SearchHandler:
     ) -> List[List[Dict[str, Any]]]:
         """Batch search and rerank for multiple queries.
 
+        Queries are reranked concurrently on a thread pool; the ONNX
+        Runtime session behind the reranker releases the GIL while
+        scoring. Each query's passages are still scored in one call.
+
         Args:
             query_list (List[str]): List of search queries
             batch_results (List[List[Dict[str, Any]]]): Initial search results for each query
@@ -71,27 +122,50 @@ class SearchHandler:
         Returns:
             List[List[Dict[str, Any]]]: Reranked results for each query
         """
-        final_results = []
+        final_results: List[List[Dict[str, Any]]] = [[] for _ in query_list]
+        jobs = []
 
-        for query, results in zip(query_list, batch_results):
+        for i, (query, results) in enumerate(zip(query_list, batch_results)):
             if not results:
-                final_results.append([])
                 continue
 
-            # Filter invalid documents
+            # Drop scraped documents whose description failed to scrape;
+            # payloads without a description (e.g. brochure chunks) are kept.
             valid_docs = [
                 doc
                 for doc in results
-                if doc.payload.get("description", "N/A") != "N/A"
-                and "Fail to scrape description"
-                not in doc.payload.get("description", "")
+                if "description" not in doc["payload"]
+                or (
+                    doc["payload"]["description"] != "N/A"
+                    and "Fail to scrape description"
+                    not in doc["payload"]["description"]
+                )
             ]
 
-            if not valid_docs:
-                final_results.append([])
-                continue
+            if valid_docs:
+                jobs.append((i, query, valid_docs))
 
-            query_results = self.search_and_rerank(query, valid_docs, topk)
-            final_results.append(query_results)
+        if len(jobs) == 1 or self.rerank_workers <= 1:
+            for i, query, valid_docs in jobs:
+                final_results[i] = self.search_and_rerank(query, valid_docs, topk)
+            return final_results
+
+        # Load once up front so workers don't all wait on the registry lock.
+        self.reranker
+        futures = [
+            (i, self.executor.submit(self.search_and_rerank, query, valid_docs, topk))
+            for i, query, valid_docs in jobs
+        ]
+        for i, future in futures:
+            try:
+                final_results[i] = future.result()
+            except Exception as e:
+                logging.error(f"❌ Rerank error for query {i}: {e}")
 
         return final_results
+
+    def close(self):
+        """Stop the rerank worker threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
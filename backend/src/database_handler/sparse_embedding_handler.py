@@ -0,0 +1,64 @@
+from typing import List
+
+from fastembed import SparseTextEmbedding
+from qdrant_client.http.models import SparseVector
+
+from .model_registry import model_registry
+
+
+class SparseEmbeddingHandler:
+    """Sparse lexical embeddings (BM25 or SPLADE) via fastembed.
+
+    Sparse vectors match exact tokens such as model numbers and spec
+    values that dense embeddings blur, and are fused with the dense
+    results for hybrid retrieval.
+    """
+
+    def __init__(self, model_name: str = "Qdrant/bm25", batch_size: int = 64):
+        """
+        Args:
+            model_name (str): fastembed sparse model, e.g. ``Qdrant/bm25`` or
+                ``prithivida/Splade_PP_en_v1``
+            batch_size (int): Inference batch size
+        """
+        self.model_name = model_name
+        self.batch_size = batch_size
+        # BM25 vectors only carry term frequencies; Qdrant applies the IDF
+        # part at query time from collection statistics.
+        self.requires_idf = "bm25" in model_name.lower()
+
+    def _load(self) -> SparseTextEmbedding:
+        return SparseTextEmbedding(model_name=self.model_name, cache_dir="./models")
+
+    @property
+    def model(self) -> SparseTextEmbedding:
+        return model_registry.get_or_load(
+            f"fastembed-sparse/{self.model_name}", self._load
+        )
+
+    def load_model(self) -> None:
+        """Load the model now instead of on the first request."""
+        self.model
+
+    @staticmethod
+    def _to_sparse_vector(embedding) -> SparseVector:
+        return SparseVector(
+            indices=embedding.indices.tolist(), values=embedding.values.tolist()
+        )
+
+    def embed_documents(self, texts: List[str]) -> List[SparseVector]:
+        """Sparse vectors for documents/chunks being indexed."""
+        return [
+            self._to_sparse_vector(embedding)
+            for embedding in self.model.embed(texts, batch_size=self.batch_size)
+        ]
+
+    def embed_queries(self, queries: List[str]) -> List[SparseVector]:
+        """Sparse vectors for search queries (query-side weighting)."""
+        return [
+            self._to_sparse_vector(embedding)
+            for embedding in self.model.query_embed(queries)
+        ]
+
+    def embed_query(self, query: str) -> SparseVector:
+        return self.embed_queries([query])[0]
@@ -1,3 +1,5 @@
+import json
+import logging
 import os
 import shutil
 import time
@@ -9,14 +11,16 @@ import tempfile
 
 import uvicorn
 from fastapi import FastAPI, File, HTTPException, UploadFile
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 import requests
-from src.agent import Agent, ListForkliftProduct
+from src.agent import Agent
 from src.database_handler.document_parser import DocumentParser
+from src.database_handler.model_registry import model_registry
 from src.schema import PdfParserRequest
 from src.app_config import app_config
 from src.schema import UserThread, UserQuestion
-
+from src.tools.retrieval import retrieval_seconds, track_retrieval
 
 app = FastAPI()
 
@@ -32,6 +36,17 @@ app.add_middleware(
 
 agent = Agent()
 
+
+@app.on_event("shutdown")
+def flush_memory():
+    agent.memory_handler.shutdown()
+
+
+@app.on_event("shutdown")
+def close_vector_store():
+    agent.database_handler.close_connection()
+
+
 UPLOAD_DIR = "uploaded_files"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
@@ -39,27 +54,74 @@ os.makedirs(UPLOAD_DIR, exist_ok=True)
 @app.get("/")
 async def root():
     current_time = time.strftime("%Y-%m-%d %H:%M:%S")
-    return {"message": "AI Agent platform is running v1!", "datetime": current_time}
+    return {
+        "message": "AI Agent platform is running v1!",
+        "datetime": current_time,
+        "model_load_times": model_registry.load_times(),
+    }
 
 
 class ChatRequest(BaseModel):
     question: str
+    user_id: str = "1"
+    thread_id: str = "1"
+    agent_name: str = "calculator"
 
 
-@app.post("/chat")
-async def chat(requets: ChatRequest):
+def _build_user_question(request: ChatRequest) -> UserQuestion:
+    """Scope the question to the caller's own user/thread history."""
     user_thread = UserThread(
-        user_id="1", thread_id="1", agent_name="calculator"
-    )
-    user_question = UserQuestion(
-        user_thread=user_thread, question=requets.question
+        user_id=request.user_id,
+        thread_id=request.thread_id,
+        agent_name=request.agent_name,
     )
+    return UserQuestion(user_thread=user_thread, question=request.question)
+
+
+@app.post("/chat")
+async def chat(request: ChatRequest):
+    user_question = _build_user_question(request)
     start_time = time.time()
-    res = agent.print_stream(user_question)
+    with track_retrieval() as retrieval_times:
+        res = await agent.ainvoke(user_question)
     end_time = time.time()
     time_taken = end_time - start_time
-    print(f"Time taken: {time_taken} seconds")
-    return {"message": res, "time_taken": time_taken}
+    retrieval_time = retrieval_seconds(retrieval_times)
+    logging.debug(f"⏱️ /chat took {time_taken:.3f}s (retrieval {retrieval_time:.3f}s)")
+    return {
+        "message": res,
+        "time_taken": time_taken,
+        "timings": {"retrieval": retrieval_time, "llm": time_taken - retrieval_time},
+    }
+
+
+@app.post("/chat/stream")
+async def chat_stream(request: ChatRequest):
+    user_question = _build_user_question(request)
+
+    async def event_stream():
+        start_time = time.time()
+        first_token_time = None
+        with track_retrieval() as retrieval_times:
+            async for event in agent.astream_events(user_question):
+                if event["event"] == "token" and first_token_time is None:
+                    first_token_time = time.time() - start_time
+                if event["event"] == "done":
+                    time_taken = time.time() - start_time
+                    retrieval_time = retrieval_seconds(retrieval_times)
+                    event["data"]["time_to_first_token"] = first_token_time
+                    event["data"]["time_taken"] = time_taken
+                    event["data"]["timings"] = {
+                        "retrieval": retrieval_time,
+                        "llm": time_taken - retrieval_time,
+                    }
+                yield f"event: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 if __name__ == "__main__":
@@ -1,7 +1,6 @@
 from langchain_core.prompts import PromptTemplate
 
-SPECIFICATION_PARSER_PROMPT = PromptTemplate.from_template(
-    """
+SPECIFICATION_PARSER_PROMPT = PromptTemplate.from_template("""
 Based on provided information, please extract the following:
 Output in this format:
                                                          
@@ -39,8 +38,7 @@ Here is the information:
 {information}
 
 Your answer:
-"""
-)
+""")
 
 SYSTEM_PROMPT = """
 You are an AI assistant who help to answer questions related to news and general inquiries.
@@ -63,6 +61,7 @@ BEHAVIOR:
 - You have access to the following tools:
   - get_news: to find the latest news about specific topics
   - get_latest_general_news: to get general news updates
+  - search_brochures: to find product details in our brochure knowledge base
 - Always try to include sources of information when available
 - Structure your responses clearly with appropriate markdown formatting
 
@@ -1,9 +1,12 @@
+import asyncio
+
 from newsapi import NewsApiClient
 from src.app_config import app_config
-import requests 
+import requests
 
 api = NewsApiClient(api_key=app_config.NEWS_API_KEY)
 
+
 def get_news_about_specific_topic(query: str):
     """
     This tool is used to get the latest news about the query
@@ -13,8 +16,7 @@ def get_news_about_specific_topic(query: str):
         list of news articles
     """
     news = api.get_everything(q=query, sort_by="publishedAt")
-    return news['articles'][:30]
-
+    return news["articles"][:30]
 
 
 def get_latest_general_news():
@@ -28,10 +30,22 @@ def get_latest_general_news():
     params = {
         "apikey": app_config.NEWSDATA_API,
         "country": "us",
-        "prioritydomain": "top"
+        "prioritydomain": "top",
     }
     response = requests.get(url, params=params)
     if response.status_code != 200:
-        raise Exception(f"❌ API request failed: {response.status_code} - {response.text}")
+        raise Exception(
+            f"❌ API request failed: {response.status_code} - {response.text}"
+        )
     data = response.json()
-    return data.get("results", [])[:20]
\ No newline at end of file
+    return data.get("results", [])[:20]
+
+
+async def aget_news_about_specific_topic(query: str):
+    """Async variant of get_news_about_specific_topic, run off the event loop."""
+    return await asyncio.to_thread(get_news_about_specific_topic, query)
+
+
+async def aget_latest_general_news():
+    """Async variant of get_latest_general_news, run off the event loop."""
+    return await asyncio.to_thread(get_latest_general_news)
@@ -0,0 +1,144 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from langchain_core.tools import StructuredTool
+
+from src.database_handler.qdrant_connector import QdrantDBClient
+
+# (start, end) perf_counter interval of every retrieval call in the current
+# request; set by track_retrieval.
+retrieval_timings: ContextVar[Optional[List[Tuple[float, float]]]] = ContextVar(
+    "retrieval_timings", default=None
+)
+
+
+@contextmanager
+def track_retrieval() -> Iterator[List[Tuple[float, float]]]:
+    """Collect the interval of every retrieval call made inside the block."""
+    timings: List[Tuple[float, float]] = []
+    token = retrieval_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        retrieval_timings.reset(token)
+
+
+def _record(start: float):
+    timings = retrieval_timings.get()
+    if timings is not None:
+        timings.append((start, time.perf_counter()))
+
+
+def retrieval_seconds(intervals: List[Tuple[float, float]]) -> float:
+    """Wall-clock time covered by retrieval intervals.
+
+    Tool calls may run in parallel, so overlapping intervals are merged
+    instead of summed.
+    """
+    total = 0.0
+    current_start = current_end = None
+    for start, end in sorted(intervals):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += current_end - current_start
+    return total
+
+
+def _format_results(results: Optional[List[Dict[str, Any]]]) -> Any:
+    if results is None:
+        return "Brochure search exceeded its latency budget; answer without it."
+    return [
+        {
+            "text": item.get("text"),
+            "score": item.get("score"),
+            "filename": item.get("payload", {}).get("filename"),
+            "file_path": item.get("payload", {}).get("file_path"),
+        }
+        for item in results
+    ]
+
+
+def build_brochure_search_tool(
+    database_handler: QdrantDBClient,
+    top_k: int = 5,
+    candidate_limit: int = 10,
+    score_threshold: Optional[float] = None,
+    latency_budget: float = 3.0,
+    workers: int = 8,
+) -> StructuredTool:
+    """Expose QdrantDBClient.search_similar_texts as an agent tool.
+
+    Searches run on the tool's own pool of ``workers`` threads, sized to the
+    number of brochure searches expected in flight at once. A search that
+    misses the latency budget is cancelled if it has not started yet; one
+    already running cannot be interrupted and keeps its worker until the
+    Qdrant query and rerank return, so a slow backend turns into budget
+    misses instead of a growing backlog.
+
+    Args:
+        database_handler (QdrantDBClient): Connected Qdrant client
+        top_k (int): Passages returned to the agent after reranking
+        candidate_limit (int): Vector search candidates passed to the reranker
+        score_threshold (Optional[float]): Minimum vector similarity score
+        latency_budget (float): Seconds to wait for results before giving up
+        workers (int): Threads running searches for this tool
+
+    Returns:
+        StructuredTool: Tool with both sync and async implementations
+    """
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="retrieval")
+
+    def _search(query: str) -> List[Dict[str, Any]]:
+        return database_handler.search_similar_texts(
+            query,
+            limit=candidate_limit,
+            topk=top_k,
+            score_threshold=score_threshold,
+        )
+
+    def search_brochures(query: str):
+        """
+        Search the product brochure knowledge base for passages relevant to the query
+        Args:
+            query: str
+        Returns:
+            list of passages with their source file
+        """
+        start = time.perf_counter()
+        future = executor.submit(_search, query)
+        try:
+            results = future.result(timeout=latency_budget)
+        except FutureTimeoutError:
+            future.cancel()
+            results = None
+        finally:
+            _record(start)
+        return _format_results(results)
+
+    async def asearch_brochures(query: str):
+        start = time.perf_counter()
+        try:
+            # Cancelling the wrapper on timeout also cancels the pool future.
+            results = await asyncio.wait_for(
+                asyncio.wrap_future(executor.submit(_search, query)),
+                timeout=latency_budget,
+            )
+        except asyncio.TimeoutError:
+            results = None
+        finally:
+            _record(start)
+        return _format_results(results)
+
+    return StructuredTool.from_function(
+        func=search_brochures, coroutine=asearch_brochures
+    )
@@ -0,0 +1,152 @@
+import asyncio
+import importlib
+import importlib.util
+import random
+import sys
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.schema import UserQuestion, UserThread
+
+N_USERS = 16
+TURNS = 5
+
+# Imported by src.agent's dependency chain but not part of uv.lock; none of
+# them is exercised by these tests.
+UNLOCKED_MODULES = {
+    "pdfplumber": {},
+    "pymupdf4llm": {},
+    "PyPDF2": {},
+    "flashrank": {"Ranker": object, "RerankRequest": object},
+    "newsapi": {"NewsApiClient": lambda **kwargs: None},
+}
+
+
+@pytest.fixture(scope="module")
+def agent_module():
+    for name, attributes in UNLOCKED_MODULES.items():
+        if name not in sys.modules and importlib.util.find_spec(name) is None:
+            module = types.ModuleType(name)
+            module.__dict__.update(attributes)
+            sys.modules[name] = module
+    return importlib.import_module("src.agent")
+
+
+class FakeMemoryHandler:
+    """Thread-safe in-memory stand-in for CachedMemoryHandler (sync and async)."""
+
+    def __init__(self):
+        self.conversations = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _key(user_thread):
+        return (user_thread.user_id, user_thread.thread_id, user_thread.agent_name)
+
+    def retrieve_conversation(self, user_thread, last_k=None):
+        with self.lock:
+            messages = list(self.conversations.get(self._key(user_thread), []))
+        if not messages:
+            return {}
+        return {"messages": messages[-last_k:] if last_k else messages}
+
+    def insert_or_update_conversation(self, conversation_infor):
+        key = self._key(conversation_infor.user_thread_infor)
+        messages = [message.model_dump() for message in conversation_infor.messages]
+        with self.lock:
+            self.conversations.setdefault(key, []).extend(messages)
+
+    async def aretrieve_conversation(self, user_thread, last_k=None):
+        await asyncio.sleep(random.uniform(0, 0.001))
+        return self.retrieve_conversation(user_thread, last_k)
+
+    async def ainsert_or_update_conversation(self, conversation_infor):
+        await asyncio.sleep(random.uniform(0, 0.001))
+        self.insert_or_update_conversation(conversation_infor)
+
+
+class FakeMessage:
+    def __init__(self, content):
+        self.content = content
+
+    def pretty_print(self):
+        pass
+
+
+class FakeReactAgent:
+    """Answers with the question and records the history it was given."""
+
+    def __init__(self):
+        self.seen = []
+        self.lock = threading.Lock()
+
+    def _answer(self, messages):
+        with self.lock:
+            self.seen.append([message["content"] for message in messages])
+        return {"messages": [FakeMessage(f"re: {messages[-1]['content']}")]}
+
+    def stream(self, state, stream_mode=None):
+        time.sleep(random.uniform(0, 0.002))
+        yield self._answer(state["messages"])
+
+    async def astream(self, state, stream_mode=None):
+        await asyncio.sleep(random.uniform(0, 0.002))
+        yield self._answer(state["messages"])
+
+
+def _make_agent(agent_module):
+    agent = agent_module.Agent.__new__(agent_module.Agent)
+    agent.memory_handler = FakeMemoryHandler()
+    agent.react_agent = FakeReactAgent()
+    return agent
+
+
+def _question(user, turn):
+    return UserQuestion(
+        user_thread=UserThread(user_id=f"user-{user}"),
+        question=f"user-{user} turn-{turn}",
+    )
+
+
+def _assert_no_bleed(agent):
+    # Every prompt only holds the history of the user asking the question.
+    for contents in agent.react_agent.seen:
+        owner = contents[-1].split()[0]
+        assert all(owner in content for content in contents), contents
+    assert len(agent.memory_handler.conversations) == N_USERS
+    for (user_id, _, _), messages in agent.memory_handler.conversations.items():
+        assert len(messages) == 2 * TURNS
+        assert all(user_id in message["content"] for message in messages)
+
+
+def test_concurrent_threads_keep_histories_separate(agent_module):
+    agent = _make_agent(agent_module)
+
+    def chat(user):
+        for turn in range(TURNS):
+            answer = agent.print_stream(_question(user, turn))
+            assert answer == f"re: user-{user} turn-{turn}"
+
+    with ThreadPoolExecutor(max_workers=N_USERS) as executor:
+        list(executor.map(chat, range(N_USERS)))
+
+    _assert_no_bleed(agent)
+
+
+def test_concurrent_tasks_keep_histories_separate(agent_module):
+    agent = _make_agent(agent_module)
+
+    async def chat(user):
+        for turn in range(TURNS):
+            answer = await agent.ainvoke(_question(user, turn))
+            assert answer == f"re: user-{user} turn-{turn}"
+
+    async def main():
+        await asyncio.gather(*(chat(user) for user in range(N_USERS)))
+
+    asyncio.run(main())
+    _assert_no_bleed(agent)
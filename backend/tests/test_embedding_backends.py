@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("sentence_transformers")
+pytest.importorskip("fastembed")
+
+from src.database_handler.embedding_backends import create_embedding_backend
+
+MODEL_NAME = "nomic-ai/nomic-embed-text-v1.5"
+TEXTS = [
+    "search_query: What is the operating temperature range?",
+    "search_document: The sensor operates from -40 °C to 85 °C.",
+    "search_document: Model WX-200 supports LoRaWAN and NB-IoT.",
+]
+
+
+def _encode_or_skip(name: str) -> np.ndarray:
+    backend = create_embedding_backend(name, MODEL_NAME)
+    try:
+        return backend.encode(TEXTS, batch_size=8, normalize=True)
+    except Exception as e:
+        pytest.skip(f"{name} backend could not load {MODEL_NAME}: {e}")
+
+
+@pytest.mark.parametrize(
+    "name, min_cosine", [("fastembed", 0.99), ("fastembed-int8", 0.95)]
+)
+def test_backend_matches_torch(name, min_cosine):
+    reference = _encode_or_skip("torch")
+    embeddings = _encode_or_skip(name)
+
+    assert embeddings.shape == reference.shape
+    cosine = np.sum(reference * embeddings, axis=1)
+    assert cosine.min() >= min_cosine
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from src.database_handler.embedding_cache import DiskEmbeddingStore, EmbeddingCache
+
+
+def test_cached_vectors_are_read_only(tmp_path):
+    cache = EmbeddingCache("model", cache_dir=str(tmp_path))
+    original = np.ones(4, dtype=np.float32)
+    stored = cache.put("text", original)
+    original[:] = 0  # the caller's array is not the cached one
+
+    for vector in (stored, cache.get("text")):
+        np.testing.assert_array_equal(vector, np.ones(4))
+        with pytest.raises(ValueError):
+            vector[0] = 2.0
+
+    fresh = EmbeddingCache("model", cache_dir=str(tmp_path))
+    from_disk = fresh.get("text")
+    assert fresh.disk_hits == 1
+    with pytest.raises(ValueError):
+        from_disk *= 2
+
+
+def test_store_sees_keys_appended_by_another_writer(tmp_path):
+    reader = DiskEmbeddingStore(str(tmp_path))
+    writer = DiskEmbeddingStore(str(tmp_path))
+    assert reader.get("a") is None
+
+    writer.put("a", np.full(3, 1.0))
+    writer.put("b", np.full(3, 2.0))
+    with open(writer.keys_path, "a", encoding="utf-8") as keys:
+        keys.write("partial")  # a writer caught mid-line
+
+    np.testing.assert_array_equal(reader.get("b"), np.full(3, 2.0))
+    np.testing.assert_array_equal(reader.get("a"), np.full(3, 1.0))
+    assert reader.get("partial") is None
+    assert len(reader) == 2
@@ -0,0 +1,148 @@
+import asyncio
+
+import pytest
+from pymongo.errors import BulkWriteError
+
+from src.database_handler.mongodb_handler import CachedMemoryHandler
+from src.schema import ConversationInfor, Message, UserThread
+
+
+class FakeCollection:
+    """Records bulk_write batches and fails the indexes it is told to."""
+
+    def __init__(self):
+        self.batches = []
+        self.fail_all = False
+        self.fail_indexes = set()
+
+    def bulk_write(self, operations, ordered=False):
+        if self.fail_all:
+            raise ConnectionError("mongo down")
+        applied = [op for i, op in enumerate(operations) if i not in self.fail_indexes]
+        self.batches.append(applied)
+        if self.fail_indexes:
+            raise BulkWriteError(
+                {
+                    "writeErrors": [
+                        {"index": i, "code": 11000, "errmsg": "failed"}
+                        for i in sorted(self.fail_indexes)
+                    ]
+                }
+            )
+
+    def pushed(self, user_id):
+        """Contents pushed to ``user_id``'s document, in write order."""
+        return [
+            message["content"]
+            for batch in self.batches
+            for op in batch
+            if op._filter["user_id"] == user_id
+            for message in op._doc["$push"]["messages"]["$each"]
+        ]
+
+
+class FakeDatabase(dict):
+    def __missing__(self, name):
+        self[name] = FakeCollection()
+        return self[name]
+
+
+@pytest.fixture
+def handler():
+    handler = CachedMemoryHandler(
+        db_name="test",
+        collection_name="live",
+        archive_collection_name="archive",
+        flush_batch_size=1000,
+        flush_interval=3600,
+    )
+    handler.db = FakeDatabase()
+    handler.collection = handler.db["live"]
+    yield handler
+    handler._stop_event.set()
+
+
+def _turn(handler, user_id, content):
+    handler.insert_or_update_conversation(
+        ConversationInfor(
+            user_thread_infor=UserThread(user_id=user_id),
+            messages=[Message(role="user", content=content)],
+        )
+    )
+
+
+def test_failed_archive_writes_are_retried_in_order(handler):
+    archive = handler.db["archive"]
+    archive.fail_all = True
+    _turn(handler, "u1", "a")
+    assert handler.flush() == 1
+    _turn(handler, "u1", "b")
+    assert handler.flush() == 1
+
+    archive.fail_all = False
+    _turn(handler, "u1", "c")
+    assert handler.flush() == 1
+
+    # The live document got every turn exactly once; the archive caught up
+    # in chronological order.
+    assert handler.collection.pushed("u1") == ["a", "b", "c"]
+    assert archive.pushed("u1") == ["a", "b", "c"]
+    assert not handler._pending and not handler._pending_archive
+
+
+def test_only_failed_live_writes_are_retried(handler):
+    _turn(handler, "u1", "a")
+    _turn(handler, "u2", "b")
+    handler.collection.fail_indexes = {0}
+    assert handler.flush() == 1
+    assert list(handler._pending) == [("u1", "1234", "MISS CHINA AI")]
+
+    handler.collection.fail_indexes = set()
+    _turn(handler, "u1", "c")
+    assert handler.flush() == 1
+    assert handler.collection.pushed("u1") == ["a", "c"]
+    assert handler.collection.pushed("u2") == ["b"]
+    assert handler.db["archive"].pushed("u1") == ["a", "c"]
+
+
+class FakeAsyncHandler:
+    def __init__(self, messages):
+        self.collection = object()
+        self.messages = messages
+        self.reads = 0
+
+    async def retrieve_conversation(self, thread_infor, last_k=None):
+        self.reads += 1
+        return {"messages": list(self.messages)} if self.messages else {}
+
+
+def test_async_path_reads_misses_with_motor_and_never_flushes_inline(handler):
+    stored = [{"role": "user", "content": "old"}]
+    handler.async_handler = FakeAsyncHandler(stored)
+    handler.flush_batch_size = 1
+    # Stop the background flusher so a wake-up request stays observable.
+    handler._stop_event.set()
+    handler._flush_requested.set()
+    handler._flush_thread.join()
+    handler._flush_requested.clear()
+    thread = UserThread(user_id="u1")
+
+    async def run():
+        await handler.ainsert_or_update_conversation(
+            ConversationInfor(
+                user_thread_infor=thread,
+                messages=[Message(role="user", content="new")],
+            )
+        )
+        first = await handler.aretrieve_conversation(thread)
+        second = await handler.aretrieve_conversation(thread, last_k=1)
+        return first, second
+
+    first, second = asyncio.run(run())
+    # The queued turn is merged into the motor read and then served from
+    # the cache; the full queue only woke the background flusher.
+    assert [m["content"] for m in first["messages"]] == ["old", "new"]
+    assert [m["content"] for m in second["messages"]] == ["new"]
+    assert handler.async_handler.reads == 1
+    assert handler.collection.batches == []
+    assert handler._flush_requested.is_set()
@@ -0,0 +1,22 @@
+from src.database_handler.point_ids import hash_point_id, legacy_doc_id
+
+
+def test_hash_point_id_has_no_collisions_for_1m_keys():
+    ids = {
+        hash_point_id(f"brochure_{doc}.md_chunk_{chunk}")
+        for doc in range(10_000)
+        for chunk in range(100)
+    }
+    assert len(ids) == 1_000_000
+    assert all(0 <= point_id < 2**64 for point_id in ids)
+
+
+def test_hash_point_id_is_deterministic():
+    key = "brochure.md_chunk_3"
+    assert hash_point_id(key) == hash_point_id(key)
+    assert hash_point_id(key) != hash_point_id("brochure.md_chunk_4")
+
+
+def test_legacy_doc_id_matches_the_old_scheme():
+    assert legacy_doc_id("brochure.md_chunk_3") < 1_000_000
+    assert legacy_doc_id("brochure.md_chunk_3") == legacy_doc_id("brochure.md_chunk_3")